@@ -4,61 +4,171 @@ Sersync Plus 构建脚本
 用于将项目打包为二进制文件
 """
 
+import argparse
+import asyncio
+import hashlib
 import os
 import sys
 import shutil
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 项目根目录
-PROJECT_ROOT = Path(__file__).parent.parent
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 BUILD_DIR = PROJECT_ROOT / "build"
 DIST_DIR = PROJECT_ROOT / "dist"
 SPEC_FILE = PROJECT_ROOT / "build.spec"
+CACHE_KEY_FILE = BUILD_DIR / ".cache-key"
 
-def clean_build():
+def _iter_build_inputs():
+    """列出影响构建结果的输入文件（排序后保证哈希稳定）"""
+    inputs = [SPEC_FILE, PROJECT_ROOT / "pyproject.toml"]
+    inputs.extend(sorted(
+        path for path in (PROJECT_ROOT / "sersync").rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    ))
+    examples_dir = PROJECT_ROOT / "examples"
+    inputs.extend(sorted(examples_dir.glob("*.xml")))
+    inputs.extend(sorted(examples_dir.glob("*.yml")))
+    return inputs
+
+def compute_cache_key():
+    """基于构建输入内容计算缓存键"""
+    hasher = hashlib.sha256()
+    for path in _iter_build_inputs():
+        hasher.update(str(path.relative_to(PROJECT_ROOT)).encode())
+        with open(path, "rb") as f:
+            while chunk := f.read(64 * 1024):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+def read_cache_key():
+    """读取上次成功构建时记录的缓存键"""
+    try:
+        return CACHE_KEY_FILE.read_text().strip()
+    except OSError:
+        return None
+
+def write_cache_key(key):
+    """记录本次构建的缓存键"""
+    CACHE_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_KEY_FILE.write_text(key)
+
+# 查找 __pycache__ 时跳过的目录（虚拟环境、版本库与构建输出）
+PYCACHE_SKIP_DIRS = {".venv", ".git", "build", "dist"}
+
+def _iter_pycache(root):
+    """递归查找 __pycache__ 目录（基于 os.scandir，不跟随符号链接）"""
+    with os.scandir(root) as it:
+        for entry in it:
+            if not entry.is_dir(follow_symlinks=False) or entry.name in PYCACHE_SKIP_DIRS:
+                continue
+            if entry.name == "__pycache__":
+                yield entry.path
+            else:
+                yield from _iter_pycache(entry.path)
+
+def _remove_dir(path):
+    """删除目录并输出日志，返回是否全部删除成功"""
+    errors = []
+
+    def onerror(func, failed_path, exc_info):
+        errors.append(failed_path)
+        print(f"   ⚠️  删除失败: {failed_path} ({exc_info[1]})")
+
+    shutil.rmtree(path, onerror=onerror)
+    if errors:
+        return False
+    print(f"   删除: {path}")
+    return True
+
+async def clean_build():
     """清理构建目录"""
     print("🧹 清理构建目录...")
-    
-    for dir_path in [BUILD_DIR, DIST_DIR]:
-        if dir_path.exists():
-            shutil.rmtree(dir_path)
-            print(f"   删除: {dir_path}")
-    
-    # 清理 __pycache__
-    for pycache in PROJECT_ROOT.rglob("__pycache__"):
-        shutil.rmtree(pycache)
-        print(f"   删除: {pycache}")
+    if not await asyncio.to_thread(_clean_build_dirs):
+        print("❌ 清理构建目录失败")
+        return False
+    return True
+
+def _clean_build_dirs():
+    """删除构建目录和 __pycache__"""
+    targets = [str(dir_path) for dir_path in [BUILD_DIR, DIST_DIR] if dir_path.exists()]
+    targets.extend(_iter_pycache(str(PROJECT_ROOT)))
+
+    # 删除操作是 I/O 密集型，使用线程池并行执行
+    with ThreadPoolExecutor() as executor:
+        return all(list(executor.map(_remove_dir, targets)))
 
-def install_dependencies():
+async def _run_command(*cmd, quiet=False):
+    """异步执行命令，返回退出码"""
+    output = asyncio.subprocess.DEVNULL if quiet else None
+    process = await asyncio.create_subprocess_exec(*cmd, stdout=output, stderr=output)
+    return await process.wait()
+
+async def install_dependencies():
     """安装构建依赖"""
     print("📦 安装构建依赖...")
     
+    # 检查是否在 Poetry 环境中
     try:
-        # 检查是否在 Poetry 环境中
-        result = subprocess.run(["poetry", "--version"], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("   使用 Poetry 安装依赖...")
-            subprocess.run(["poetry", "install", "--with", "dev"], check=True)
-        else:
-            print("   使用 pip 安装 PyInstaller...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+        use_poetry = await _run_command("poetry", "--version", quiet=True) == 0
+    except FileNotFoundError:
+        use_poetry = False
+    
+    if use_poetry:
+        print("   使用 Poetry 安装依赖...")
+        cmd = ["poetry", "install", "--with", "dev"]
+    else:
+        print("   使用 pip 安装 PyInstaller...")
+        cmd = [sys.executable, "-m", "pip", "install", "pyinstaller"]
+    
+    returncode = await _run_command(*cmd)
+    if returncode != 0:
+        print(f"❌ 依赖安装失败: {' '.join(cmd)} 返回 {returncode}")
+        return False
+    return True
+
+async def prepare_build(fresh=False):
+    """准备构建环境：先清理构建目录，再安装依赖"""
+    # 清理须在依赖安装之前完成，避免与安装过程同时改写目录
+    if fresh and not await clean_build():
+        return False
+    return await install_dependencies()
+
+def precompile_bytecode():
+    """预编译字节码（基于哈希校验的 .pyc，供 PyInstaller 和首次导入复用）"""
+    print("⚙️  预编译字节码...")
+    
+    cmd = [
+        sys.executable, "-m", "compileall",
+        "-q",
+        "-o", "0",
+        "--invalidation-mode", "checked-hash",
+        "-j", "0",  # 并行编译
+        str(PROJECT_ROOT / "sersync")
+    ]
+    
+    try:
+        subprocess.run(cmd, check=True)
+        return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ 依赖安装失败: {e}")
-        sys.exit(1)
+        print(f"❌ 字节码预编译失败: {e}")
+        return False
 
-def build_binary():
+def build_binary(fresh=False):
     """构建二进制文件"""
     print("🔨 开始构建二进制文件...")
     
-    # 构建命令
+    # 构建命令（默认保留 PyInstaller 工作目录以支持增量构建）
     cmd = [
         "pyinstaller",
-        "--clean",  # 清理临时文件
         "--noconfirm",  # 不询问覆盖
         str(SPEC_FILE)
     ]
+    if fresh:
+        cmd.insert(1, "--clean")  # 清理临时文件
     
     print(f"   执行命令: {' '.join(cmd)}")
     
@@ -71,17 +181,21 @@ def build_binary():
         print(f"❌ 构建失败: {e}")
         return False
 
-def test_binary():
-    """测试构建的二进制文件"""
-    print("🧪 测试二进制文件...")
-    
-    # 查找生成的可执行文件
+def get_binary_path():
+    """获取生成的可执行文件路径"""
     if platform.system() == "Windows":
         binary_name = "sersync-plus.exe"
     else:
         binary_name = "sersync-plus"
     
-    binary_path = DIST_DIR / binary_name
+    return DIST_DIR / binary_name
+
+def test_binary():
+    """测试构建的二进制文件"""
+    print("🧪 测试二进制文件...")
+    
+    # 查找生成的可执行文件
+    binary_path = get_binary_path()
     
     if not binary_path.exists():
         print(f"❌ 找不到二进制文件: {binary_path}")
@@ -119,8 +233,20 @@ def show_build_info():
     print(f"🖥️  系统平台: {platform.system()} {platform.machine()}")
     print(f"🐍 Python 版本: {sys.version}")
 
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Sersync Plus 二进制构建工具")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="全新构建：清理构建目录并传递 --clean 给 PyInstaller"
+    )
+    return parser.parse_args()
+
 def main():
     """主函数"""
+    args = parse_args()
+    
     print("🚀 Sersync Plus 二进制构建工具")
     print("=" * 50)
     
@@ -129,11 +255,24 @@ def main():
         print("❌ 请在项目根目录运行此脚本")
         sys.exit(1)
     
+    # 构建输入未变化且二进制仍在时，跳过 PyInstaller
+    cache_key = compute_cache_key()
+    if not args.fresh and read_cache_key() == cache_key and get_binary_path().exists():
+        print("\n♻️  构建输入未变化，复用已有二进制文件")
+        build_step = ("构建二进制文件", lambda: True)
+    else:
+        def build_step_func():
+            if not build_binary(fresh=args.fresh):
+                return False
+            write_cache_key(cache_key)
+            return True
+        build_step = ("构建二进制文件", build_step_func)
+    
     # 构建步骤
     steps = [
-        ("清理构建目录", clean_build),
-        ("安装构建依赖", install_dependencies),
-        ("构建二进制文件", build_binary),
+        ("准备构建环境", lambda: asyncio.run(prepare_build(fresh=args.fresh))),
+        ("预编译字节码", precompile_bytecode),
+        build_step,
         ("测试二进制文件", test_binary),
     ]
     
@@ -141,13 +280,9 @@ def main():
         print(f"\n📋 {step_name}")
         print("-" * 30)
         
-        if step_func == build_binary or step_func == test_binary:
-            # 这些步骤有返回值
-            if not step_func():
-                print(f"\n❌ 构建失败于步骤: {step_name}")
-                sys.exit(1)
-        else:
-            step_func()
+        if not step_func():
+            print(f"\n❌ 构建失败于步骤: {step_name}")
+            sys.exit(1)
     
     # 显示构建结果
     show_build_info()
@@ -12,7 +12,15 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from sersync.core.engine import SersyncEngine
-from sersync.config.models import SersyncConfig
-
 __all__ = ["SersyncEngine", "SersyncConfig", "__version__"]
+
+
+def __getattr__(name):
+    """延迟导入引擎和配置模型，避免 CLI 启动（--help/--version）时加载整个引擎"""
+    if name == "SersyncEngine":
+        from sersync.core.engine import SersyncEngine
+        return SersyncEngine
+    if name == "SersyncConfig":
+        from sersync.config.models import SersyncConfig
+        return SersyncConfig
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,15 +7,77 @@
 - 基于时间戳、文件大小、内容哈希
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, List
 from datetime import datetime
 import hashlib
+import mmap
+import os
+import time
 import structlog
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# 流式哈希的分块大小
+HASH_CHUNK_SIZE = 64 * 1024
+
+# 批量处理的默认线程数（I/O 密集，可超过 CPU 核数）
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def compute_content_hash(file_path: str) -> Optional[str]:
+    """
+    计算文件内容哈希
+
+    优先使用 BLAKE3（如已安装，通过 mmap 多线程并行哈希），
+    否则使用 SHA-256 直接扫描 mmap 映射的页面，避免额外的缓冲区拷贝；
+    无法映射的文件（如空文件）回退为按块读取。
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制哈希字符串，文件不存在时返回 None
+    """
+    try:
+        if BLAKE3_AVAILABLE:
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()
+
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb', buffering=0) as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+                    return hasher.hexdigest()
+                except (OSError, ValueError):
+                    pass
+
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    return hasher.hexdigest()
+
+
+def _hash_local_file(file_path: str) -> Optional[str]:
+    """计算本地文件哈希，失败返回 None"""
+    try:
+        return compute_content_hash(file_path)
+    except Exception as e:
+        logger.warning("Failed to compute hash", path=file_path, error=str(e))
+        return None
+
 
 class ConflictType(Enum):
     """冲突类型"""
@@ -30,13 +92,16 @@ class ConflictType(Enum):
 class FileMetadata:
     """文件元数据"""
 
+    __slots__ = ('path', 'exists', 'mtime', 'size', '_content_hash', '_hash_fn')
+
     def __init__(
         self,
         path: str,
         exists: bool = True,
         mtime: Optional[float] = None,
         size: Optional[int] = None,
-        content_hash: Optional[str] = None
+        content_hash: Optional[str] = None,
+        hash_fn: Optional[Callable[[str], Optional[str]]] = None
     ):
         """
         初始化文件元数据
@@ -46,13 +111,33 @@ class FileMetadata:
             exists: 文件是否存在
             mtime: 修改时间戳
             size: 文件大小（字节）
-            content_hash: 内容哈希值（MD5）
+            content_hash: 内容哈希值（BLAKE3 或 SHA-256）
+            hash_fn: 延迟计算哈希的函数 (path) -> hash，首次访问 content_hash 时调用
         """
         self.path = path
         self.exists = exists
         self.mtime = mtime
         self.size = size
-        self.content_hash = content_hash
+        self._content_hash = content_hash
+        self._hash_fn = hash_fn
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """内容哈希值（延迟计算并缓存）"""
+        if self._content_hash is None and self._hash_fn is not None:
+            self._content_hash = self._hash_fn(self.path)
+            self._hash_fn = None
+        return self._content_hash
+
+    @content_hash.setter
+    def content_hash(self, value: Optional[str]):
+        self._content_hash = value
+        self._hash_fn = None
+
+    @property
+    def computed_hash(self) -> Optional[str]:
+        """已计算的内容哈希（不触发计算）"""
+        return self._content_hash
 
     @classmethod
     def from_local_file(cls, file_path: str) -> 'FileMetadata':
@@ -65,29 +150,19 @@ class FileMetadata:
         Returns:
             FileMetadata 实例
         """
-        path = Path(file_path)
-
-        if not path.exists():
+        # 单次 stat 同时完成存在性检查和统计信息获取
+        try:
+            st = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
             return cls(path=file_path, exists=False)
 
-        # 获取文件统计信息
-        stat = path.stat()
-
-        # 计算文件哈希（仅对小文件，< 10MB）
-        content_hash = None
-        if stat.st_size < 10 * 1024 * 1024:  # 10MB
-            try:
-                with open(path, 'rb') as f:
-                    content_hash = hashlib.md5(f.read()).hexdigest()
-            except Exception as e:
-                logger.warning("Failed to compute hash", path=file_path, error=str(e))
-
+        # 内容哈希延迟到真正需要比较内容时才计算
         return cls(
             path=file_path,
             exists=True,
-            mtime=stat.st_mtime,
-            size=stat.st_size,
-            content_hash=content_hash
+            mtime=st.st_mtime,
+            size=st.st_size,
+            hash_fn=_hash_local_file
         )
 
     def __repr__(self):
@@ -97,9 +172,17 @@ class FileMetadata:
         )
 
 
+# 批量检测中表示"文件不存在"的共享哨兵，避免为每个缺失路径分配占位对象
+_MISSING = FileMetadata("", exists=False)
+
+
 class ConflictInfo:
     """冲突信息"""
 
+    __slots__ = (
+        'conflict_type', 'local_meta', 'remote_meta', 'base_meta', 'details', '_detected_at_ns'
+    )
+
     def __init__(
         self,
         conflict_type: ConflictType,
@@ -123,7 +206,12 @@ class ConflictInfo:
         self.remote_meta = remote_meta
         self.base_meta = base_meta
         self.details = details
-        self.detected_at = datetime.now()
+        self._detected_at_ns = time.time_ns()
+
+    @property
+    def detected_at(self) -> datetime:
+        """检测时间（按需构造 datetime）"""
+        return datetime.fromtimestamp(self._detected_at_ns / 1e9)
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -278,14 +366,19 @@ class ConflictDetector:
         # 检查修改时间（带容差）
         if meta1.mtime and meta2.mtime:
             time_diff = abs(meta1.mtime - meta2.mtime)
-            if time_diff > self.time_tolerance:
-                # 时间不同，但如果启用了内容哈希，继续检查
-                if not self.enable_content_hash:
-                    return False
-
-        # 检查内容哈希（如果可用）
-        if self.enable_content_hash and meta1.content_hash and meta2.content_hash:
-            return meta1.content_hash == meta2.content_hash
+            if time_diff <= self.time_tolerance:
+                # 大小和时间都一致，无需计算哈希
+                return True
+            # 时间不同，但如果启用了内容哈希，继续检查
+            if not self.enable_content_hash:
+                return False
+
+        # 检查内容哈希（仅在此时才触发延迟计算）
+        if self.enable_content_hash:
+            hash1 = meta1.content_hash
+            hash2 = meta2.content_hash if hash1 else None
+            if hash1 and hash2:
+                return hash1 == hash2
 
         # 如果没有哈希，只能根据大小和时间判断
         return True
@@ -312,19 +405,87 @@ class ConflictDetector:
         # 获取所有文件路径
         all_paths = set(local_files.keys()) | set(remote_files.keys())
 
-        for path in all_paths:
-            local_meta = local_files.get(path, FileMetadata(path, exists=False))
-            remote_meta = remote_files.get(path, FileMetadata(path, exists=False))
+        def _detect_one(path: str) -> Optional[ConflictInfo]:
+            # 缺失的一方使用共享哨兵，仅在真正产生冲突时才分配带路径的元数据
+            local_meta = local_files.get(path) or _MISSING
+            remote_meta = remote_files.get(path) or _MISSING
             base_meta = base_files.get(path) if base_files else None
 
             conflict = self.detect_conflict(local_meta, remote_meta, base_meta)
-            if conflict:
-                conflicts[path] = conflict
+            if conflict is not None:
+                if conflict.local_meta is _MISSING:
+                    conflict.local_meta = FileMetadata(path, exists=False)
+                if conflict.remote_meta is _MISSING:
+                    conflict.remote_meta = FileMetadata(path, exists=False)
+            return conflict
+
+        # 预筛选掉可以确定无冲突的路径，只对剩余路径逐一检测
+        candidates = self._candidate_paths(all_paths, local_files, remote_files, base_files)
+
+        # 逐文件检测相互独立，哈希与磁盘读取会释放 GIL，使用线程池并行
+        with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor:
+            futures = {executor.submit(_detect_one, path): path for path in candidates}
+            for future in as_completed(futures):
+                conflict = future.result()
+                if conflict:
+                    conflicts[futures[future]] = conflict
 
         logger.info(
             "Batch conflict detection completed",
             total_files=len(all_paths),
+            candidates=len(candidates),
             conflicts_found=len(conflicts)
         )
 
         return conflicts
+
+    def _candidate_paths(
+        self,
+        all_paths: Iterable[str],
+        local_files: Dict[str, FileMetadata],
+        remote_files: Dict[str, FileMetadata],
+        base_files: Optional[Dict[str, FileMetadata]] = None
+    ) -> List[str]:
+        """
+        预筛选可能存在冲突的路径（一次遍历，只比较存在性、大小和修改时间）
+
+        以下情况可以确定无冲突，不再提交线程池逐一检测：
+        - 双方都存在，大小相同且修改时间在容差内
+        - 仅一方存在，且基准版本不存在
+        - 双方都不存在
+
+        Args:
+            all_paths: 所有文件路径
+            local_files: 本地文件字典
+            remote_files: 远程文件字典
+            base_files: 基准版本文件字典（可选）
+
+        Returns:
+            需要逐一检测的路径列表
+        """
+        tolerance = self.time_tolerance
+        candidates = []
+
+        for path in all_paths:
+            local_meta = local_files.get(path)
+            remote_meta = remote_files.get(path)
+            local_exists = local_meta is not None and local_meta.exists
+            remote_exists = remote_meta is not None and remote_meta.exists
+
+            if local_exists and remote_exists:
+                if (
+                    local_meta.size == remote_meta.size
+                    and local_meta.mtime and remote_meta.mtime
+                    and abs(local_meta.mtime - remote_meta.mtime) <= tolerance
+                ):
+                    continue
+            elif local_exists or remote_exists:
+                base_meta = base_files.get(path) if base_files else None
+                if base_meta is None or not base_meta.exists:
+                    continue
+            else:
+                continue
+
+            candidates.append(path)
+
+        return candidates
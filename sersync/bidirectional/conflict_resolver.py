@@ -7,14 +7,23 @@
 - 支持备份冲突文件
 """
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
 from datetime import datetime
+import itertools
 import shutil
+import time
 import structlog
 
-from sersync.bidirectional.conflict_detector import ConflictInfo, ConflictType, FileMetadata
+from sersync.bidirectional.conflict_detector import (
+    DEFAULT_MAX_WORKERS,
+    ConflictInfo,
+    ConflictType,
+    FileMetadata,
+)
 
 logger = structlog.get_logger()
 
@@ -34,6 +43,10 @@ class ResolutionStrategy(Enum):
 class ResolutionResult:
     """解决结果"""
 
+    __slots__ = (
+        'success', 'strategy_used', 'action_taken', 'backup_paths', 'error_message', '_resolved_at_ns'
+    )
+
     def __init__(
         self,
         success: bool,
@@ -57,7 +70,12 @@ class ResolutionResult:
         self.action_taken = action_taken
         self.backup_paths = backup_paths or {}
         self.error_message = error_message
-        self.resolved_at = datetime.now()
+        self._resolved_at_ns = time.time_ns()
+
+    @property
+    def resolved_at(self) -> datetime:
+        """解决时间（按需构造 datetime）"""
+        return datetime.fromtimestamp(self._resolved_at_ns / 1e9)
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -98,6 +116,9 @@ class ConflictResolver:
         self.enable_backup = enable_backup
         self.manual_callback = manual_callback
 
+        # 备份文件名的单调序号
+        self._backup_seq = itertools.count()
+
         # 创建备份目录
         if self.enable_backup:
             self.backup_dir.mkdir(parents=True, exist_ok=True)
@@ -112,7 +133,8 @@ class ConflictResolver:
     def resolve(
         self,
         conflict: ConflictInfo,
-        strategy: Optional[ResolutionStrategy] = None
+        strategy: Optional[ResolutionStrategy] = None,
+        timestamp: Optional[str] = None
     ) -> ResolutionResult:
         """
         解决冲突
@@ -120,13 +142,14 @@ class ConflictResolver:
         Args:
             conflict: 冲突信息
             strategy: 解决策略（如果为 None，使用默认策略）
+            timestamp: 备份文件名时间戳（如果为 None，备份时取当前时间）
 
         Returns:
             ResolutionResult
         """
         strategy = strategy or self.default_strategy
 
-        logger.info(
+        logger.debug(
             "Resolving conflict",
             conflict_type=conflict.conflict_type.value,
             path=conflict.local_meta.path,
@@ -134,25 +157,8 @@ class ConflictResolver:
         )
 
         try:
-            # 根据策略选择解决方法
-            if strategy == ResolutionStrategy.KEEP_NEWER:
-                return self._resolve_keep_newer(conflict)
-            elif strategy == ResolutionStrategy.KEEP_OLDER:
-                return self._resolve_keep_older(conflict)
-            elif strategy == ResolutionStrategy.KEEP_LARGER:
-                return self._resolve_keep_larger(conflict)
-            elif strategy == ResolutionStrategy.KEEP_LOCAL:
-                return self._resolve_keep_local(conflict)
-            elif strategy == ResolutionStrategy.KEEP_REMOTE:
-                return self._resolve_keep_remote(conflict)
-            elif strategy == ResolutionStrategy.BACKUP_BOTH:
-                return self._resolve_backup_both(conflict)
-            elif strategy == ResolutionStrategy.MANUAL:
-                return self._resolve_manual(conflict)
-            elif strategy == ResolutionStrategy.SKIP:
-                return self._resolve_skip(conflict)
-            else:
-                raise ValueError(f"Unknown strategy: {strategy}")
+            # 根据策略查表选择解决方法
+            return self._STRATEGIES[strategy](self, conflict, timestamp)
 
         except Exception as e:
             logger.error("Failed to resolve conflict", error=str(e), exc_info=True)
@@ -163,7 +169,7 @@ class ConflictResolver:
                 error_message=str(e)
             )
 
-    def _resolve_keep_newer(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_keep_newer(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """保留较新的文件"""
         local_meta = conflict.local_meta
         remote_meta = conflict.remote_meta
@@ -189,7 +195,7 @@ class ConflictResolver:
         if local_meta.mtime and remote_meta.mtime:
             if local_meta.mtime > remote_meta.mtime:
                 # 本地较新
-                backup_path = self._backup_file(remote_meta, "remote") if self.enable_backup else None
+                backup_path = self._backup_file(remote_meta, "remote", timestamp=timestamp) if self.enable_backup else None
                 return ResolutionResult(
                     success=True,
                     strategy_used=ResolutionStrategy.KEEP_NEWER,
@@ -198,7 +204,7 @@ class ConflictResolver:
                 )
             else:
                 # 远程较新
-                backup_path = self._backup_file(local_meta, "local") if self.enable_backup else None
+                backup_path = self._backup_file(local_meta, "local", timestamp=timestamp) if self.enable_backup else None
                 return ResolutionResult(
                     success=True,
                     strategy_used=ResolutionStrategy.KEEP_NEWER,
@@ -213,7 +219,7 @@ class ConflictResolver:
             action_taken="Use local (default)"
         )
 
-    def _resolve_keep_older(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_keep_older(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """保留较旧的文件"""
         local_meta = conflict.local_meta
         remote_meta = conflict.remote_meta
@@ -241,7 +247,7 @@ class ConflictResolver:
             action_taken="Use local (default)"
         )
 
-    def _resolve_keep_larger(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_keep_larger(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """保留较大的文件"""
         local_meta = conflict.local_meta
         remote_meta = conflict.remote_meta
@@ -269,11 +275,11 @@ class ConflictResolver:
             action_taken="Use local (default)"
         )
 
-    def _resolve_keep_local(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_keep_local(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """总是保留本地版本"""
         backup_path = None
         if self.enable_backup and conflict.remote_meta.exists:
-            backup_path = self._backup_file(conflict.remote_meta, "remote")
+            backup_path = self._backup_file(conflict.remote_meta, "remote", timestamp=timestamp)
 
         return ResolutionResult(
             success=True,
@@ -282,11 +288,11 @@ class ConflictResolver:
             backup_paths={"remote": backup_path} if backup_path else {}
         )
 
-    def _resolve_keep_remote(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_keep_remote(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """总是保留远程版本"""
         backup_path = None
         if self.enable_backup and conflict.local_meta.exists:
-            backup_path = self._backup_file(conflict.local_meta, "local")
+            backup_path = self._backup_file(conflict.local_meta, "local", timestamp=timestamp)
 
         return ResolutionResult(
             success=True,
@@ -295,21 +301,15 @@ class ConflictResolver:
             backup_paths={"local": backup_path} if backup_path else {}
         )
 
-    def _resolve_backup_both(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_backup_both(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """备份双方，保留两个版本"""
         backup_paths = {}
 
-        # 备份本地文件
-        if conflict.local_meta.exists:
-            local_backup = self._backup_file(conflict.local_meta, "local")
-            if local_backup:
-                backup_paths["local"] = local_backup
-
-        # 备份远程文件
-        if conflict.remote_meta.exists:
-            remote_backup = self._backup_file(conflict.remote_meta, "remote")
-            if remote_backup:
-                backup_paths["remote"] = remote_backup
+        # 顺序复制两份备份；批量解决时各冲突已在线程池中并行
+        for meta, source in ((conflict.local_meta, "local"), (conflict.remote_meta, "remote")):
+            backup_path = self._backup_file(meta, source, timestamp=timestamp)
+            if backup_path:
+                backup_paths[source] = backup_path
 
         return ResolutionResult(
             success=True,
@@ -318,22 +318,27 @@ class ConflictResolver:
             backup_paths=backup_paths
         )
 
-    def _resolve_manual(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_manual(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """需要手动介入"""
+        handler = None
         if self.manual_callback:
             try:
                 # 调用手动解决回调
                 chosen_strategy = self.manual_callback(conflict)
+                # MANUAL 不会再次进入本方法，避免回调循环
                 if chosen_strategy != ResolutionStrategy.MANUAL:
-                    # 使用回调返回的策略重新解决
-                    return self.resolve(conflict, chosen_strategy)
+                    handler = self._STRATEGIES.get(chosen_strategy)
             except Exception as e:
                 logger.error("Manual callback failed", error=str(e))
 
+        if handler:
+            # 直接调用回调所选策略的解决方法，不再经过 resolve 重新分发
+            return handler(self, conflict, timestamp)
+
         # 备份双方，等待手动处理
-        return self._resolve_backup_both(conflict)
+        return self._resolve_backup_both(conflict, timestamp)
 
-    def _resolve_skip(self, conflict: ConflictInfo) -> ResolutionResult:
+    def _resolve_skip(self, conflict: ConflictInfo, timestamp: Optional[str] = None) -> ResolutionResult:
         """跳过同步"""
         return ResolutionResult(
             success=True,
@@ -341,13 +346,35 @@ class ConflictResolver:
             action_taken="Skipped synchronization"
         )
 
-    def _backup_file(self, file_meta: FileMetadata, source: str) -> Optional[str]:
+    # 策略分发表 {策略: 解决方法}
+    _STRATEGIES: Dict[ResolutionStrategy, Callable[['ConflictResolver', ConflictInfo, Optional[str]], ResolutionResult]] = {
+        ResolutionStrategy.KEEP_NEWER: _resolve_keep_newer,
+        ResolutionStrategy.KEEP_OLDER: _resolve_keep_older,
+        ResolutionStrategy.KEEP_LARGER: _resolve_keep_larger,
+        ResolutionStrategy.KEEP_LOCAL: _resolve_keep_local,
+        ResolutionStrategy.KEEP_REMOTE: _resolve_keep_remote,
+        ResolutionStrategy.BACKUP_BOTH: _resolve_backup_both,
+        ResolutionStrategy.MANUAL: _resolve_manual,
+        ResolutionStrategy.SKIP: _resolve_skip,
+    }
+
+    def _backup_file(
+        self,
+        file_meta: FileMetadata,
+        source: str,
+        preserve_metadata: bool = True,
+        timestamp: Optional[str] = None,
+        seq: Optional[int] = None
+    ) -> Optional[str]:
         """
         备份文件
 
         Args:
             file_meta: 文件元数据
             source: 来源标识 ("local" 或 "remote")
+            preserve_metadata: 是否保留文件时间戳和权限
+            timestamp: 备份时间戳（为 None 时使用当前时间）
+            seq: 备份序号（为 None 时自动递增），保证同一秒内文件名不冲突
 
         Returns:
             备份文件路径，失败返回 None
@@ -357,15 +384,20 @@ class ConflictResolver:
 
         try:
             # 生成备份文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if timestamp is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            if seq is None:
+                seq = next(self._backup_seq)
             file_path = Path(file_meta.path)
-            backup_name = f"{file_path.stem}_{source}_{timestamp}{file_path.suffix}"
+            backup_name = f"{file_path.stem}_{source}_{timestamp}_{seq:06d}{file_path.suffix}"
             backup_path = self.backup_dir / backup_name
 
-            # 复制文件
-            shutil.copy2(file_path, backup_path)
+            # 复制文件（Linux 上 copyfile 走 copy_file_range/sendfile 零拷贝路径）
+            shutil.copyfile(file_path, backup_path)
+            if preserve_metadata:
+                shutil.copystat(file_path, backup_path)
 
-            logger.info(
+            logger.debug(
                 "File backed up",
                 source_path=file_meta.path,
                 backup_path=str(backup_path)
@@ -398,15 +430,26 @@ class ConflictResolver:
         """
         results = {}
 
-        for path, conflict in conflicts.items():
-            result = self.resolve(conflict, strategy)
-            results[path] = result
+        # 整批共享一个时间戳，避免逐文件格式化时间（按参数传递，并发批次互不影响）
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # 备份文件复制是 I/O 密集操作，使用线程池并行处理
+        with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.resolve, conflict, strategy, timestamp): path
+                for path, conflict in conflicts.items()
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
+        # 逐个冲突的日志为 DEBUG 级别，这里按批次汇总
+        successful = sum(1 for r in results.values() if r.success)
         logger.info(
             "Batch conflict resolution completed",
             total_conflicts=len(conflicts),
-            successful=sum(1 for r in results.values() if r.success),
-            failed=sum(1 for r in results.values() if not r.success)
+            successful=successful,
+            failed=len(results) - successful,
+            by_strategy=dict(Counter(r.strategy_used.value for r in results.values()))
         )
 
         return results
@@ -9,8 +9,12 @@
 """
 
 import asyncio
+import fnmatch
+import re
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import structlog
 
@@ -33,10 +37,49 @@ from sersync.bidirectional.unison_engine import (
 
 logger = structlog.get_logger()
 
+# 事件队列容量上限，队列满时事件回调等待（反压），内存占用不随事件风暴增长
+EVENT_QUEUE_MAXSIZE = 10_000
+
+
+def compile_ignore_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    """
+    将 Unison 风格的忽略模式编译为单个正则表达式
+
+    支持 Name（匹配文件名）、Path（匹配相对路径）、BelowPath（路径及其子路径）
+    和 Regex（原样使用）；未带前缀的模式按 Name 处理。
+
+    Args:
+        patterns: 忽略模式列表
+
+    Returns:
+        编译后的正则，模式为空时返回 None
+    """
+    alternatives = []
+    for pattern in patterns:
+        kind, _, value = pattern.strip().partition(' ')
+        value = value.strip()
+        if not value:
+            kind, value = 'Name', kind
+
+        if kind == 'Regex':
+            alternatives.append(f'(?:{value})\\Z')
+        elif kind == 'Path':
+            alternatives.append(fnmatch.translate(value))
+        elif kind == 'BelowPath':
+            alternatives.append(f'{re.escape(value.rstrip("/"))}(?:/.*)?\\Z')
+        else:
+            alternatives.append(f'(?:.*/)?{fnmatch.translate(value)}')
+
+    if not alternatives:
+        return None
+    return re.compile('|'.join(f'(?:{alt})' for alt in alternatives), re.DOTALL)
+
 
 class SyncEvent:
     """同步事件"""
 
+    __slots__ = ('event_type', 'file_path', 'source', 'timestamp_ns', 'metadata')
+
     def __init__(
         self,
         event_type: str,
@@ -58,13 +101,66 @@ class SyncEvent:
         self.event_type = event_type
         self.file_path = file_path
         self.source = source
-        self.timestamp = timestamp or datetime.now()
+        # 以纳秒整数保存，datetime 按需构造
+        self.timestamp_ns = (
+            int(timestamp.timestamp() * 1e9) if timestamp else time.time_ns()
+        )
         self.metadata = metadata
 
+    @property
+    def timestamp(self) -> datetime:
+        """事件时间戳（按需构造 datetime）"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
     def __repr__(self):
         return f"SyncEvent({self.source}:{self.event_type}:{self.file_path})"
 
 
+class DedupWorkQueue:
+    """按文件路径合并事件的工作队列（每个路径分别保留本地和远程的最新事件）"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, SyncEvent]] = {}
+        self._order: deque = deque()
+        self._not_empty = asyncio.Event()
+
+    def add(self, event: SyncEvent):
+        """
+        添加事件，同一路径同一来源的事件只保留最新一个
+
+        Args:
+            event: 同步事件
+        """
+        entry = self._entries.get(event.file_path)
+        if entry is None:
+            self._entries[event.file_path] = {event.source: event}
+            self._order.append(event.file_path)
+        else:
+            entry[event.source] = event
+        self._not_empty.set()
+
+    async def wait(self):
+        """等待队列中有事件"""
+        await self._not_empty.wait()
+
+    def drain(self) -> List[Tuple[str, Dict[str, SyncEvent]]]:
+        """
+        按到达顺序取出所有待处理路径
+
+        Returns:
+            [(文件路径, {来源: SyncEvent})]
+        """
+        batch = []
+        while self._order:
+            file_path = self._order.popleft()
+            batch.append((file_path, self._entries.pop(file_path)))
+        self._not_empty.clear()
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
 class BidirectionalCoordinator:
     """双向同步协调器"""
 
@@ -103,9 +199,12 @@ class BidirectionalCoordinator:
         self.sync_interval = sync_interval
         self.enable_unison = enable_unison
 
+        # 忽略模式预编译为单个正则，事件入队前过滤
+        self._ignore_re = compile_ignore_patterns(ignore_patterns or [])
+
         # 事件队列
-        self.local_events: asyncio.Queue = asyncio.Queue()
-        self.remote_events: asyncio.Queue = asyncio.Queue()
+        self.local_events: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+        self.remote_events: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
 
         # 冲突检测和解决
         self.conflict_detector = ConflictDetector(
@@ -153,10 +252,20 @@ class BidirectionalCoordinator:
             'conflicts_resolved': 0,
             'syncs_completed': 0,
             'syncs_failed': 0,
+            'events_deduplicated': 0,
+            'queue_high_watermark': 0,
         }
 
-        # 事件缓冲（用于合并短时间内的多个事件）
-        self.event_buffer: Dict[str, SyncEvent] = {}
+        # 源头去重：同一路径同类事件在 min_interval 内只入队一次
+        # {(来源, 路径): (事件类型, 单调时钟)}
+        self._recent_events: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self.event_min_interval = 0.1  # 秒
+
+        # 内容哈希缓存 {相对路径: (mtime, size, hash)}，mtime 和大小未变时复用
+        self._hash_cache: Dict[str, Tuple[float, int, str]] = {}
+
+        # 事件缓冲（用于合并短时间内的多个事件，按路径和来源去重）
+        self.event_buffer = DedupWorkQueue()
         self.buffer_timeout = 5  # 秒
 
         logger.info(
@@ -213,6 +322,13 @@ class BidirectionalCoordinator:
         logger.info("Stopping bidirectional coordinator")
         self._running = False
 
+        # 唤醒阻塞在队列上的事件处理器（队列已满时处理器未阻塞，随后会被取消）
+        for queue in (self.local_events, self.remote_events):
+            try:
+                queue.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
+
         # 取消所有任务
         for task in self._tasks:
             if not task.done():
@@ -225,6 +341,27 @@ class BidirectionalCoordinator:
             stats=self.stats
         )
 
+    def _is_ignored(self, file_path: str) -> bool:
+        """检查相对路径是否匹配忽略模式"""
+        return self._ignore_re is not None and self._ignore_re.match(file_path) is not None
+
+    def _is_duplicate_event(self, source: str, event_type: str, file_path: str) -> bool:
+        """同一来源、路径和事件类型在 event_min_interval 内重复出现时返回 True"""
+        now = time.monotonic()
+        key = (source, file_path)
+        last = self._recent_events.get(key)
+        if last and last[0] == event_type and now - last[1] < self.event_min_interval:
+            self.stats['events_deduplicated'] += 1
+            return True
+        self._recent_events[key] = (event_type, now)
+        return False
+
+    def _record_queue_depth(self, queue: asyncio.Queue):
+        """更新事件队列深度的最高水位"""
+        depth = queue.qsize()
+        if depth > self.stats['queue_high_watermark']:
+            self.stats['queue_high_watermark'] = depth
+
     async def on_local_event(self, event_type: str, file_path: str):
         """
         处理本地文件事件
@@ -235,28 +372,29 @@ class BidirectionalCoordinator:
         """
         # 转换为相对路径
         try:
-            rel_path = Path(file_path).relative_to(self.local_root)
+            rel_path = str(Path(file_path).relative_to(self.local_root))
         except ValueError:
             # 不在监控目录内
             return
 
-        # 获取文件元数据
-        metadata = FileMetadata.from_local_file(file_path)
+        if self._is_ignored(rel_path) or self._is_duplicate_event("local", event_type, rel_path):
+            return
 
+        # 文件元数据在冲突检测时再获取，反映合并窗口结束时的文件状态
         event = SyncEvent(
             event_type=event_type,
-            file_path=str(rel_path),
-            source="local",
-            metadata=metadata
+            file_path=rel_path,
+            source="local"
         )
 
         await self.local_events.put(event)
         self.stats['local_events'] += 1
+        self._record_queue_depth(self.local_events)
 
         logger.debug(
             "Local event received",
             event_type=event_type,
-            path=str(rel_path)
+            path=rel_path
         )
 
     async def on_remote_event(self, event_type: str, file_path: str):
@@ -267,6 +405,9 @@ class BidirectionalCoordinator:
             event_type: 事件类型
             file_path: 文件路径（相对路径）
         """
+        if self._is_ignored(file_path) or self._is_duplicate_event("remote", event_type, file_path):
+            return
+
         event = SyncEvent(
             event_type=event_type,
             file_path=file_path,
@@ -276,6 +417,7 @@ class BidirectionalCoordinator:
 
         await self.remote_events.put(event)
         self.stats['remote_events'] += 1
+        self._record_queue_depth(self.remote_events)
 
         logger.debug(
             "Remote event received",
@@ -318,16 +460,14 @@ class BidirectionalCoordinator:
 
         while self._running:
             try:
-                event = await asyncio.wait_for(
-                    self.local_events.get(),
-                    timeout=1.0
-                )
+                # 直接阻塞等待事件，停止时由哨兵 None 唤醒
+                event = await self.local_events.get()
+                if event is None:
+                    break
 
                 # 添加到缓冲区（合并短时间内的多个事件）
-                self.event_buffer[event.file_path] = event
+                self.event_buffer.add(event)
 
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -341,16 +481,14 @@ class BidirectionalCoordinator:
 
         while self._running:
             try:
-                event = await asyncio.wait_for(
-                    self.remote_events.get(),
-                    timeout=1.0
-                )
+                # 直接阻塞等待事件，停止时由哨兵 None 唤醒
+                event = await self.remote_events.get()
+                if event is None:
+                    break
 
                 # 添加到缓冲区
-                self.event_buffer[event.file_path] = event
+                self.event_buffer.add(event)
 
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -364,17 +502,17 @@ class BidirectionalCoordinator:
 
         while self._running:
             try:
-                await asyncio.sleep(self.buffer_timeout)
+                # 空闲时阻塞等待，不做周期性唤醒
+                await self.event_buffer.wait()
 
-                if not self.event_buffer:
-                    continue
+                # 等待一个缓冲窗口，合并短时间内的后续事件
+                await asyncio.sleep(self.buffer_timeout)
 
-                # 获取缓冲的事件
-                buffered_events = list(self.event_buffer.values())
-                self.event_buffer.clear()
+                # 去重记录只在最小间隔内有效，每个缓冲窗口结束后清空
+                self._recent_events.clear()
 
-                # 处理事件
-                await self._handle_buffered_events(buffered_events)
+                # 获取缓冲的事件（同一路径的本地和远程事件都保留）
+                await self._handle_buffered_events(self.event_buffer.drain())
 
             except asyncio.CancelledError:
                 break
@@ -383,23 +521,27 @@ class BidirectionalCoordinator:
 
         logger.debug("Buffer flush worker stopped")
 
-    async def _handle_buffered_events(self, events: List[SyncEvent]):
+    async def _handle_buffered_events(
+        self,
+        events_by_path: List[Tuple[str, Dict[str, SyncEvent]]]
+    ):
         """
         处理缓冲的事件
 
         Args:
-            events: 事件列表
+            events_by_path: [(路径, {来源: 事件})] 列表，即 DedupWorkQueue.drain() 的结果
         """
-        if not events:
+        if not events_by_path:
             return
 
         logger.info(
             "Processing buffered events",
-            count=len(events)
+            paths=len(events_by_path),
+            count=sum(len(entry) for _, entry in events_by_path)
         )
 
         # 检测冲突
-        conflicts = await self._detect_conflicts_for_events(events)
+        conflicts = await self._detect_conflicts_for_events(events_by_path)
 
         if conflicts:
             logger.info(
@@ -417,62 +559,81 @@ class BidirectionalCoordinator:
 
     async def _detect_conflicts_for_events(
         self,
-        events: List[SyncEvent]
+        events_by_path: List[Tuple[str, Dict[str, SyncEvent]]]
     ) -> Dict[str, ConflictInfo]:
         """
         为事件检测冲突
 
         Args:
-            events: 事件列表
+            events_by_path: [(路径, {来源: 事件})] 列表
 
         Returns:
             冲突字典 {路径: ConflictInfo}
         """
+        # 只有同时存在本地和远程事件的路径才可能冲突（事件已由 DedupWorkQueue 按路径和来源分组）
+        candidates = [
+            (file_path, file_events["local"], file_events["remote"])
+            for file_path, file_events in events_by_path
+            if "local" in file_events and "remote" in file_events
+        ]
+        if not candidates:
+            return {}
+
+        # stat 和内容哈希是阻塞 I/O，逐文件放到线程中并发检测
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._detect_one, *candidate) for candidate in candidates),
+            return_exceptions=True
+        )
+
         conflicts = {}
+        for (file_path, _, _), result in zip(candidates, results):
+            if isinstance(result, Exception):
+                logger.error("Conflict detection failed", path=file_path, error=str(result))
+            elif result:
+                conflicts[file_path] = result
 
-        # 按文件路径分组事件
-        events_by_path: Dict[str, List[SyncEvent]] = {}
-        for event in events:
-            if event.file_path not in events_by_path:
-                events_by_path[event.file_path] = []
-            events_by_path[event.file_path].append(event)
-
-        # 检测每个文件的冲突
-        for file_path, file_events in events_by_path.items():
-            # 查找本地和远程事件
-            local_event = next(
-                (e for e in file_events if e.source == "local"),
-                None
-            )
-            remote_event = next(
-                (e for e in file_events if e.source == "remote"),
-                None
-            )
+        return conflicts
 
-            # 如果同时有本地和远程事件，可能有冲突
-            if local_event and remote_event:
-                # 获取文件元数据
-                local_meta = local_event.metadata or FileMetadata(
-                    path=str(self.local_root / file_path),
-                    exists=False
-                )
+    def _detect_one(
+        self,
+        file_path: str,
+        local_event: SyncEvent,
+        remote_event: SyncEvent
+    ) -> Optional[ConflictInfo]:
+        """检测单个文件的冲突（在工作线程中执行）"""
+        # 获取文件元数据
+        local_meta = local_event.metadata or FileMetadata.from_local_file(
+            str(self.local_root / file_path)
+        )
+        self._apply_cached_hash(file_path, local_meta)
 
-                # 远程元数据（简化处理，实际应通过 SSH 获取）
-                remote_meta = FileMetadata(
-                    path=file_path,
-                    exists=remote_event.event_type != "DELETE"
-                )
+        # 远程元数据（简化处理，实际应通过 SSH 获取）
+        remote_meta = FileMetadata(
+            path=file_path,
+            exists=remote_event.event_type != "DELETE"
+        )
 
-                # 检测冲突
-                conflict = self.conflict_detector.detect_conflict(
-                    local_meta,
-                    remote_meta
-                )
+        # 检测冲突
+        conflict = self.conflict_detector.detect_conflict(
+            local_meta,
+            remote_meta
+        )
 
-                if conflict:
-                    conflicts[file_path] = conflict
+        self._remember_hash(file_path, local_meta)
+        return conflict
 
-        return conflicts
+    def _apply_cached_hash(self, file_path: str, meta: FileMetadata):
+        """mtime 和大小与缓存一致时复用缓存的内容哈希，跳过重新计算"""
+        cached = self._hash_cache.get(file_path)
+        if cached and meta.exists and cached[:2] == (meta.mtime, meta.size):
+            meta.content_hash = cached[2]
+
+    def _remember_hash(self, file_path: str, meta: FileMetadata):
+        """记录检测过程中计算出的内容哈希"""
+        if not meta.exists:
+            self._hash_cache.pop(file_path, None)
+        elif meta.computed_hash:
+            self._hash_cache[file_path] = (meta.mtime, meta.size, meta.computed_hash)
 
     async def _resolve_conflicts(self, conflicts: Dict[str, ConflictInfo]):
         """
@@ -481,7 +642,8 @@ class BidirectionalCoordinator:
         Args:
             conflicts: 冲突字典
         """
-        results = self.conflict_resolver.batch_resolve(conflicts)
+        # 解决冲突涉及备份复制等阻塞 I/O，放到线程中执行，避免阻塞事件循环
+        results = await asyncio.to_thread(self.conflict_resolver.batch_resolve, conflicts)
 
         successful = sum(1 for r in results.values() if r.success)
         self.stats['conflicts_resolved'] += successful
@@ -7,17 +7,93 @@
 - 提供安全的元信息存储
 """
 
+import heapq
 import json
 import hashlib
 import os
+import re
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime
 import structlog
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# 日志条目超过该数量时压缩为快照
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+# 缓冲的日志记录距上次落盘超过该时间后，在下次追加时写入并 fsync
+JOURNAL_SYNC_INTERVAL = 1.0  # 秒
+
+# 冲突备份文件名中的时间戳：<name>.conflict.<YYYYmmdd_HHMMSS>.<node_id>
+_BACKUP_TIMESTAMP_RE = re.compile(r'\.conflict\.(\d{8}_\d{6})\.')
+
+# 批量写入冲突备份的并发线程数
+BACKUP_MAX_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Linux FICLONE ioctl：在 btrfs/XFS 等文件系统上创建写时复制的 reflink
+_FICLONE = 0x40049409
+
+
+@lru_cache(maxsize=None)
+def generate_path_hash(watch_path: str, remote_name: str) -> str:
+    """
+    生成 watch 路径 + 远程名称的唯一标识
+    
+    该标识会写入默认元信息目录路径并被远程节点引用，必须与节点安装的
+    可选依赖无关，因此固定使用 MD5（非安全用途）。
+    """
+    unique_string = f"{watch_path}:{remote_name}"
+    return hashlib.md5(unique_string.encode(), usedforsecurity=False).hexdigest()[:8]
+
+
+def dumps_state(state: Dict[str, Any]) -> bytes:
+    """序列化状态字典为 UTF-8 JSON 字节（优先使用 orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(state, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(state, ensure_ascii=False, sort_keys=True).encode('utf-8')
+
+
+def loads_state(data: bytes) -> Dict[str, Any]:
+    """反序列化 JSON 字节为状态字典（优先使用 orjson）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _clone_file_into(dst, source_path: str) -> None:
+    """
+    将源文件内容写入已打开的空目标文件
+
+    优先使用 reflink（写时复制，之后对源文件的原地修改不影响备份），
+    文件系统不支持时回退为普通复制。不使用硬链接，避免备份与源文件共享 inode。
+    """
+    with open(source_path, 'rb') as src:
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+
 
 class MetadataManager:
     """双向同步元信息管理器"""
@@ -37,12 +113,35 @@ class MetadataManager:
         # 生成安全的元信息路径
         self.metadata_paths = self._generate_safe_paths(metadata_config)
         
+        # 预先构造常用路径对象，避免每次调用重复拼接
+        self._state_dir_path = Path(self.metadata_paths['state_dir'])
+        self._conflict_dir_path = Path(self.metadata_paths['conflict_dir'])
+        self._state_file_path = self._state_dir_path / 'sync_state.json'
+        self._journal_file_path = self._state_dir_path / 'sync_state.log'
+        self._node_id_path = self._state_dir_path / 'node_id'
+        
         # 确保目录存在
         self._ensure_directories()
         
         # 节点ID
         self.node_id = self._get_or_create_node_id()
         
+        # 内存中的同步状态（首次访问时从磁盘加载，修改后由 flush 统一落盘）
+        self._state: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._state_lock = threading.RLock()
+        
+        # 追加日志（修改先缓冲在内存，定期写入并 fsync，flush 时压缩进快照）
+        self._journal_entries = 0
+        self._journal_buffer: List[bytes] = []
+        self._journal_synced_at = time.monotonic()
+        
+        # 上次清理后新建的冲突备份数（None 表示尚未清理过）
+        self._backups_since_cleanup: Optional[int] = None
+        
+        # 冲突备份文件计数（首次需要时扫描目录，之后随创建和清理增减）
+        self._backup_count: Optional[int] = None
+        
         logger.info(
             "Metadata manager initialized",
             watch_path=str(self.watch_path),
@@ -108,46 +207,54 @@ class MetadataManager:
     
     def _generate_path_hash(self) -> str:
         """生成路径唯一标识"""
-        unique_string = f"{self.watch_path}:{self.remote_name}"
-        return hashlib.md5(unique_string.encode()).hexdigest()[:8]
+        return generate_path_hash(str(self.watch_path), self.remote_name)
     
     def _ensure_directories(self):
         """确保所有必要的目录存在"""
-        for path in [self.metadata_paths['state_dir'], self.metadata_paths['conflict_dir']]:
-            Path(path).mkdir(parents=True, exist_ok=True)
+        for path in [self._state_dir_path, self._conflict_dir_path]:
+            path.mkdir(parents=True, exist_ok=True)
     
     def _get_or_create_node_id(self) -> str:
         """获取或创建节点ID"""
-        node_id_file = Path(self.metadata_paths['state_dir']) / 'node_id'
-        
-        if node_id_file.exists():
-            return node_id_file.read_text().strip()
+        if self._node_id_path.exists():
+            return self._node_id_path.read_text().strip()
         else:
             # 生成新的节点ID
             import uuid
             node_id = f"node-{uuid.uuid4().hex[:8]}"
-            node_id_file.write_text(node_id)
+            self._node_id_path.write_text(node_id)
             return node_id
     
     def get_sync_state_file(self) -> Path:
         """获取同步状态文件路径"""
-        return Path(self.metadata_paths['state_dir']) / 'sync_state.json'
+        return self._state_file_path
+    
+    def get_sync_journal_file(self) -> Path:
+        """获取同步状态追加日志路径"""
+        return self._journal_file_path
     
     def load_sync_state(self) -> Dict[str, Any]:
         """
-        加载同步状态
+        加载同步状态（首次调用时从磁盘读取，之后返回内存中的状态）
         
         Returns:
             同步状态字典
         """
-        state_file = self.get_sync_state_file()
+        with self._state_lock:
+            if self._state is None:
+                self._state = self._read_sync_state()
+                self._replay_journal(self._state)
+            return self._state
+    
+    def _read_sync_state(self) -> Dict[str, Any]:
+        """从磁盘读取同步状态"""
+        state_file = self._state_file_path
         
         if not state_file.exists():
             return self._create_initial_state()
         
         try:
-            with open(state_file, 'r', encoding='utf-8') as f:
-                state = json.load(f)
+            state = loads_state(state_file.read_bytes())
             
             # 验证状态格式
             if not self._validate_state_format(state):
@@ -160,6 +267,66 @@ class MetadataManager:
             logger.error("Failed to load sync state", error=str(e))
             return self._create_initial_state()
     
+    def _replay_journal(self, state: Dict[str, Any]):
+        """在快照之上重放追加日志"""
+        journal_file = self._journal_file_path
+        if not journal_file.exists():
+            return
+        
+        files = state['files']
+        try:
+            with open(journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = loads_state(line)
+                    except ValueError:
+                        # 末尾可能是崩溃时未写完的行
+                        logger.warning("Truncated sync journal entry ignored")
+                        break
+                    
+                    if record['op'] == 'set':
+                        files[record['path']] = record['state']
+                    elif record['op'] == 'del':
+                        files.pop(record['path'], None)
+                    self._journal_entries += 1
+        except Exception as e:
+            logger.error("Failed to replay sync journal", error=str(e))
+        
+        if self._journal_entries:
+            self._dirty = True
+    
+    def _append_journal(self, *records: Dict[str, Any]):
+        """缓冲状态修改日志，超过同步间隔时落盘，超过阈值时压缩为快照"""
+        if not records:
+            return
+        
+        self._journal_buffer.extend(dumps_state(record) + b'\n' for record in records)
+        self._journal_entries += len(records)
+        
+        if self._journal_entries > JOURNAL_COMPACT_THRESHOLD:
+            self.flush()
+        elif time.monotonic() - self._journal_synced_at >= JOURNAL_SYNC_INTERVAL:
+            self.sync_journal()
+    
+    def sync_journal(self):
+        """将缓冲的日志记录一次写入并 fsync（没有缓冲记录时直接返回）"""
+        with self._state_lock:
+            self._journal_synced_at = time.monotonic()
+            if not self._journal_buffer:
+                return
+            
+            try:
+                with open(self._journal_file_path, 'ab') as f:
+                    f.write(b''.join(self._journal_buffer))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                # 保留缓冲，下次落盘或快照时重试
+                logger.error("Failed to append sync journal", error=str(e))
+                return
+            
+            self._journal_buffer.clear()
+    
     def save_sync_state(self, state: Dict[str, Any]):
         """
         保存同步状态
@@ -167,28 +334,47 @@ class MetadataManager:
         Args:
             state: 同步状态字典
         """
-        try:
-            state_file = self.get_sync_state_file()
-            
-            # 更新时间戳和版本
-            state['last_updated'] = datetime.now().isoformat()
-            state['version'] = state.get('version', 0) + 1
-            
-            # 原子写入
-            temp_file = state_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2, ensure_ascii=False)
-            
-            temp_file.replace(state_file)
-            
-            logger.debug(
-                "Sync state saved",
-                version=state['version'],
-                files_count=len(state.get('files', {}))
-            )
-            
-        except Exception as e:
-            logger.error("Failed to save sync state", error=str(e))
+        with self._state_lock:
+            self._state = state
+            try:
+                state_file = self._state_file_path
+                
+                # 更新时间戳和版本
+                state['last_updated'] = datetime.now().isoformat()
+                state['version'] = state.get('version', 0) + 1
+                
+                # 原子写入（先 fsync 临时文件再替换，保证落盘）
+                data = dumps_state(state)
+                temp_file = state_file.with_suffix('.tmp')
+                with open(temp_file, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                
+                temp_file.replace(state_file)
+                self._dirty = False
+                
+                # 快照已包含全部修改，丢弃缓冲并截断追加日志
+                self._journal_buffer.clear()
+                journal_file = self._journal_file_path
+                if self._journal_entries or journal_file.exists():
+                    journal_file.unlink(missing_ok=True)
+                    self._journal_entries = 0
+                
+                logger.debug(
+                    "Sync state saved",
+                    version=state['version'],
+                    files_count=len(state.get('files', {}))
+                )
+                
+            except Exception as e:
+                logger.error("Failed to save sync state", error=str(e))
+    
+    def flush(self):
+        """将内存中的状态写入快照并清空追加日志"""
+        with self._state_lock:
+            if self._dirty and self._state is not None:
+                self.save_sync_state(self._state)
     
     def _create_initial_state(self) -> Dict[str, Any]:
         """创建初始同步状态"""
@@ -208,7 +394,7 @@ class MetadataManager:
     
     def update_file_state(self, file_path: str, mtime: float, size: int, checksum: Optional[str] = None):
         """
-        更新文件状态
+        更新文件状态（修改内存并追加日志，flush 时压缩为快照）
         
         Args:
             file_path: 相对于watch目录的文件路径
@@ -216,30 +402,83 @@ class MetadataManager:
             size: 文件大小
             checksum: 文件校验和（可选）
         """
-        state = self.load_sync_state()
-        
-        state['files'][file_path] = {
-            'mtime': mtime,
-            'size': size,
-            'checksum': checksum,
-            'last_modified_by': self.node_id,
-            'updated_at': datetime.now().isoformat()
-        }
-        
-        self.save_sync_state(state)
+        with self._state_lock:
+            state = self.load_sync_state()
+            
+            file_state = {
+                'mtime': mtime,
+                'size': size,
+                'checksum': checksum,
+                'last_modified_by': self.node_id,
+                'updated_at': datetime.now().isoformat()
+            }
+            state['files'][file_path] = file_state
+            
+            self._dirty = True
+            self._append_journal({'op': 'set', 'path': file_path, 'state': file_state})
     
     def remove_file_state(self, file_path: str):
         """
-        移除文件状态
+        移除文件状态（修改内存并追加日志，flush 时压缩为快照）
         
         Args:
             file_path: 相对于watch目录的文件路径
         """
-        state = self.load_sync_state()
+        with self._state_lock:
+            state = self.load_sync_state()
+            
+            if file_path in state['files']:
+                del state['files'][file_path]
+                self._dirty = True
+                self._append_journal({'op': 'del', 'path': file_path})
+    
+    def bulk_update_file_states(self, updates: Iterable[Tuple[str, float, int]]):
+        """
+        批量更新文件状态（一次加锁、一次追加日志）
+        
+        Args:
+            updates: [(相对于watch目录的文件路径, 修改时间戳, 文件大小)]
+        """
+        with self._state_lock:
+            files = self.load_sync_state()['files']
+            # 持久化格式保持 ISO 字符串，与旧版本节点和已有状态文件兼容；整批共用一个时间
+            updated_at = datetime.now().isoformat()
+            
+            records = []
+            for file_path, mtime, size in updates:
+                file_state = {
+                    'mtime': mtime,
+                    'size': size,
+                    'checksum': None,
+                    'last_modified_by': self.node_id,
+                    'updated_at': updated_at
+                }
+                files[file_path] = file_state
+                records.append({'op': 'set', 'path': file_path, 'state': file_state})
+            
+            if records:
+                self._dirty = True
+                self._append_journal(*records)
+    
+    def bulk_remove_file_states(self, file_paths: Iterable[str]):
+        """
+        批量移除文件状态（一次加锁、一次追加日志）
         
-        if file_path in state['files']:
-            del state['files'][file_path]
-            self.save_sync_state(state)
+        Args:
+            file_paths: 相对于watch目录的文件路径集合
+        """
+        with self._state_lock:
+            files = self.load_sync_state()['files']
+            
+            records = [
+                {'op': 'del', 'path': file_path}
+                for file_path in file_paths
+                if files.pop(file_path, None) is not None
+            ]
+            
+            if records:
+                self._dirty = True
+                self._append_journal(*records)
     
     def get_file_state(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
@@ -251,8 +490,7 @@ class MetadataManager:
         Returns:
             文件状态字典或None
         """
-        state = self.load_sync_state()
-        return state['files'].get(file_path)
+        return self.load_sync_state()['files'].get(file_path)
     
     def create_conflict_backup(self, file_path: str, content: bytes) -> str:
         """
@@ -265,43 +503,125 @@ class MetadataManager:
         Returns:
             备份文件路径
         """
+        return self.create_conflict_backups([(file_path, content)])[0]
+    
+    def create_conflict_backups(self, files: List[Tuple[str, bytes]]) -> List[str]:
+        """
+        批量创建冲突备份文件（多个文件时在线程池中并发写入）
+        
+        Args:
+            files: [(原文件路径, 文件内容)] 列表
+            
+        Returns:
+            与输入顺序一致的备份文件路径列表
+        """
+        def write_content(dst, content: bytes):
+            dst.write(content)
+        
+        return self._store_backups(files, write_content)
+    
+    def copy_conflict_backups(self, files: List[Tuple[str, str]]) -> List[str]:
+        """
+        批量从磁盘文件创建冲突备份（优先 reflink，不支持时复制）
+        
+        Args:
+            files: [(原文件路径, 磁盘上待备份的文件)] 列表
+            
+        Returns:
+            与输入顺序一致的备份文件路径列表
+        """
+        return self._store_backups(files, _clone_file_into)
+    
+    def _open_new_backup(self, base_name: str):
+        """以独占方式创建备份文件，同名备份已存在时追加序号，从不覆盖已有备份"""
+        backup_path = self._conflict_dir_path / base_name
+        seq = 0
+        while True:
+            try:
+                return backup_path, open(backup_path, 'xb')
+            except FileExistsError:
+                seq += 1
+                backup_path = self._conflict_dir_path / f"{base_name}.{seq}"
+    
+    def _store_backups(self, files: List[Tuple[str, Any]], store) -> List[str]:
+        """按统一命名规则创建新备份文件并调用 store(打开的备份文件, payload) 写入"""
+        if not files:
+            return []
+        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f"{Path(file_path).name}.conflict.{timestamp}.{self.node_id}"
-        backup_path = Path(self.metadata_paths['conflict_dir']) / backup_name
+        conflict_dir = self._conflict_dir_path
         
-        backup_path.write_bytes(content)
+        def store_backup(item: Tuple[str, Any]) -> str:
+            file_path, payload = item
+            backup_path, dst = self._open_new_backup(
+                f"{Path(file_path).name}.conflict.{timestamp}.{self.node_id}"
+            )
+            try:
+                with dst:
+                    store(dst, payload)
+            except BaseException:
+                backup_path.unlink(missing_ok=True)
+                raise
+            logger.debug(
+                "Conflict backup created",
+                original_file=file_path,
+                backup_file=str(backup_path)
+            )
+            return str(backup_path)
         
-        logger.info(
-            "Conflict backup created",
-            original_file=file_path,
-            backup_file=str(backup_path)
-        )
+        if self._backups_since_cleanup is not None:
+            self._backups_since_cleanup += len(files)
+        
+        if len(files) == 1:
+            backup_paths = [store_backup(files[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(BACKUP_MAX_WORKERS, len(files))) as executor:
+                backup_paths = list(executor.map(store_backup, files))
+        
+        if self._backup_count is not None:
+            self._backup_count += len(backup_paths)
         
-        return str(backup_path)
+        logger.info("Conflict backups created", count=len(backup_paths), conflict_dir=str(conflict_dir))
+        return backup_paths
+    
+    def _scan_backups(self) -> List[os.DirEntry]:
+        """列出冲突备份文件（基于 os.scandir，仅使用目录项信息，不额外 stat）"""
+        try:
+            with os.scandir(self._conflict_dir_path) as it:
+                return [
+                    entry for entry in it
+                    if '.conflict.' in entry.name and entry.is_file(follow_symlinks=False)
+                ]
+        except FileNotFoundError:
+            return []
     
     def cleanup_old_backups(self, max_backups: int = 10):
         """
-        清理旧的冲突备份文件
+        清理旧的冲突备份文件（上次清理后没有新备份时直接返回）
         
         Args:
             max_backups: 保留的最大备份数量
         """
+        if self._backups_since_cleanup == 0:
+            return
+        
         try:
-            conflict_dir = Path(self.metadata_paths['conflict_dir'])
-            if not conflict_dir.exists():
-                return
-            
-            # 获取所有备份文件，按修改时间排序
-            backup_files = []
-            for file_path in conflict_dir.glob('*.conflict.*'):
-                backup_files.append((file_path.stat().st_mtime, file_path))
+            # 按文件名中的时间戳排序，无需逐个 stat
+            backup_files = self._scan_backups()
+            excess = len(backup_files) - max_backups
             
-            backup_files.sort(reverse=True)  # 最新的在前
+            if excess > 0:
+                def backup_timestamp(entry: os.DirEntry) -> str:
+                    match = _BACKUP_TIMESTAMP_RE.search(entry.name)
+                    return match.group(1) if match else ''
+                
+                # 删除超出数量限制的旧备份
+                for entry in heapq.nsmallest(excess, backup_files, key=backup_timestamp):
+                    os.unlink(entry.path)
+                    logger.debug("Removed old conflict backup", file=entry.path)
             
-            # 删除超出数量限制的旧备份
-            for _, file_path in backup_files[max_backups:]:
-                file_path.unlink()
-                logger.debug("Removed old conflict backup", file=str(file_path))
+            self._backups_since_cleanup = 0
+            self._backup_count = min(len(backup_files), max_backups)
                 
         except Exception as e:
             logger.error("Failed to cleanup old backups", error=str(e))
@@ -311,18 +631,18 @@ class MetadataManager:
         return self.metadata_paths['lock_file']
     
     def get_stats(self) -> Dict[str, Any]:
-        """获取元信息统计"""
+        """获取元信息统计（读取内存状态和备份计数，不访问磁盘）"""
         state = self.load_sync_state()
         
-        conflict_dir = Path(self.metadata_paths['conflict_dir'])
-        conflict_count = len(list(conflict_dir.glob('*.conflict.*'))) if conflict_dir.exists() else 0
+        if self._backup_count is None:
+            self._backup_count = len(self._scan_backups())
         
         return {
             'node_id': self.node_id,
             'version': state.get('version', 0),
             'files_tracked': len(state.get('files', {})),
             'last_updated': state.get('last_updated'),
-            'conflict_backups': conflict_count,
+            'conflict_backups': self._backup_count,
             'metadata_dir': self.metadata_paths['state_dir'],
             'conflict_dir': self.metadata_paths['conflict_dir']
         }
\ No newline at end of file
@@ -9,19 +9,22 @@
 
 import asyncio
 import os
-import hashlib
+import time
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime
 from enum import Enum
 import structlog
 
-from sersync.bidirectional.metadata_manager import MetadataManager
+from sersync.bidirectional.metadata_manager import MetadataManager, generate_path_hash, loads_state
 from sersync.core.sync_engine import SyncEngine
 from sersync.config.models import RemoteConfig, RsyncConfig
 
 logger = structlog.get_logger()
 
+# 同一轮双向同步中并发执行的 rsync 传输数上限
+MAX_PARALLEL_SYNC_OPERATIONS = 8
+
 
 class ConflictType(Enum):
     """冲突类型"""
@@ -41,14 +44,25 @@ class ConflictResolution(Enum):
     BACKUP_BOTH = "backup_both"
 
 
+# (本地变化类型, 远程变化类型) -> 冲突类型，未列出的组合不构成冲突
+_CONFLICT_TABLE = {
+    ('MODIFY', 'MODIFY'): ConflictType.BOTH_MODIFIED,
+    ('DELETE', 'MODIFY'): ConflictType.LOCAL_DELETED_REMOTE_MODIFIED,
+    ('MODIFY', 'DELETE'): ConflictType.REMOTE_DELETED_LOCAL_MODIFIED,
+    ('CREATE', 'CREATE'): ConflictType.BOTH_CREATED,
+}
+
+
 class FileChange:
     """文件变化信息"""
     
+    __slots__ = ('file_path', 'change_type', 'source', 'timestamp')
+    
     def __init__(self, file_path: str, change_type: str, source: str):
         self.file_path = file_path
         self.change_type = change_type  # CREATE, MODIFY, DELETE
         self.source = source  # local, remote
-        self.timestamp = datetime.now()
+        self.timestamp = time.monotonic_ns()  # 仅用于比较先后顺序
 
 
 class BidirectionalSyncEngine:
@@ -71,6 +85,8 @@ class BidirectionalSyncEngine:
             metadata_config: 元信息配置
         """
         self.watch_path = Path(watch_path)
+        # 字符串形式的监控目录，热路径中用 os.path 拼接，避免构造 Path 对象
+        self._watch_str = str(self.watch_path)
         self.remote_config = remote_config
         self.rsync_config = rsync_config
         
@@ -89,12 +105,23 @@ class BidirectionalSyncEngine:
             fail_log=None  # 双向同步有自己的错误处理
         )
         
-        # 冲突解决策略
-        self.conflict_strategy = ConflictResolution(remote_config.conflict_strategy)
+        # 路径哈希在引擎生命周期内不变，初始化时计算一次
+        self._path_hash = generate_path_hash(str(self.watch_path), remote_config.name)
+        
+        # 冲突解决策略（解析配置时已转换为枚举）
+        self.conflict_strategy = (
+            remote_config.resolved_strategy or ConflictResolution(remote_config.conflict_strategy)
+        )
         
         # 同步锁
         self._sync_lock = asyncio.Lock()
         
+        # 后台清理任务（持有引用，避免任务被垃圾回收）
+        self._bg_tasks: set = set()
+        
+        # 本轮冲突解决中待创建的备份 [(相对路径, 本地文件路径)]
+        self._pending_backups: List[Tuple[str, str]] = []
+        
         logger.info(
             "Bidirectional sync engine initialized",
             watch_path=str(self.watch_path),
@@ -114,9 +141,11 @@ class BidirectionalSyncEngine:
             try:
                 logger.info("Starting bidirectional sync")
                 
-                # 1. 获取本地和远程状态
-                local_state = self.metadata_manager.load_sync_state()
-                remote_state = await self._fetch_remote_state()
+                # 1. 获取本地和远程状态（本地磁盘读取与远程拉取相互独立，并发执行）
+                local_state, remote_state = await asyncio.gather(
+                    asyncio.to_thread(self.metadata_manager.load_sync_state),
+                    self._fetch_remote_state()
+                )
                 
                 # 2. 检测变化和冲突
                 changes = self._detect_changes(local_state, remote_state)
@@ -128,11 +157,12 @@ class BidirectionalSyncEngine:
                 # 4. 执行同步操作
                 sync_results = await self._execute_sync_operations(resolved_changes)
                 
-                # 5. 更新本地状态
+                # 5. 更新本地状态（批量修改后一次性落盘）
                 await self._update_local_state(resolved_changes)
+                await asyncio.to_thread(self.metadata_manager.flush)
                 
-                # 6. 清理旧备份
-                self.metadata_manager.cleanup_old_backups()
+                # 6. 清理旧备份（与同步结果无关，在后台线程中执行，不阻塞返回）
+                self._schedule_backup_cleanup()
                 
                 result = {
                     'success': True,
@@ -159,6 +189,15 @@ class BidirectionalSyncEngine:
                     'files_synced': 0
                 }
     
+    def _schedule_backup_cleanup(self):
+        """在后台启动旧备份清理，上一次清理尚未结束时跳过"""
+        if self._bg_tasks:
+            return
+        
+        task = asyncio.create_task(asyncio.to_thread(self.metadata_manager.cleanup_old_backups))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
     async def _fetch_remote_state(self) -> Dict[str, Any]:
         """
         获取远程同步状态
@@ -167,26 +206,28 @@ class BidirectionalSyncEngine:
             远程状态字典
         """
         try:
-            # 通过rsync获取远程元信息文件
-            remote_state_path = self.metadata_manager.get_sync_state_file().with_suffix('.remote')
-            
-            # 构建rsync命令获取远程状态文件
-            cmd = self._build_fetch_remote_state_cmd(str(remote_state_path))
+            # SSH 模式直接从标准输出读取远程状态，rsync daemon 模式落地到临时文件
+            remote_state_path = None
+            if self.rsync_config.ssh_enabled:
+                cmd = self._build_fetch_remote_state_cmd()
+            else:
+                remote_state_path = self.metadata_manager.get_sync_state_file().with_suffix('.remote')
+                cmd = self._build_fetch_remote_state_cmd(str(remote_state_path))
             
-            # 执行命令
+            # 执行命令（daemon 模式下状态写入文件，标准输出无用，直接丢弃）
             process = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE if remote_state_path is None else asyncio.subprocess.DEVNULL,
                 stderr=asyncio.subprocess.PIPE
             )
             
             stdout, stderr = await process.communicate()
             
-            if process.returncode == 0 and remote_state_path.exists():
+            if process.returncode == 0 and remote_state_path is None:
                 # 成功获取远程状态
-                import json
-                with open(remote_state_path, 'r', encoding='utf-8') as f:
-                    remote_state = json.load(f)
+                return loads_state(stdout)
+            elif process.returncode == 0 and remote_state_path.exists():
+                remote_state = loads_state(remote_state_path.read_bytes())
                 
                 # 清理临时文件
                 remote_state_path.unlink()
@@ -194,40 +235,41 @@ class BidirectionalSyncEngine:
                 return remote_state
             else:
                 # 远程状态不存在或获取失败，返回空状态
-                logger.debug("Remote state not found or fetch failed", stderr=stderr.decode())
+                logger.debug(
+                    "Remote state not found or fetch failed",
+                    returncode=process.returncode,
+                    stderr=stderr.decode(errors='replace')
+                )
                 return self._create_empty_remote_state()
                 
         except Exception as e:
             logger.error("Failed to fetch remote state", error=str(e))
             return self._create_empty_remote_state()
     
-    def _build_fetch_remote_state_cmd(self, local_path: str) -> List[str]:
-        """构建获取远程状态的rsync命令"""
+    def _build_fetch_remote_state_cmd(self, local_path: Optional[str] = None) -> List[str]:
+        """
+        构建获取远程状态的命令
+        
+        SSH 模式下通过 ssh cat 将状态文件输出到标准输出；rsync daemon 模式
+        无法输出到标准输出，仍通过 rsync 下载到 local_path。
+        """
+        # 临时方案：通过约定的路径获取
+        remote_metadata_path = f"/var/sersync/bidirectional/{self._get_path_hash()}/state/sync_state.json"
+        
+        if self.rsync_config.ssh_enabled:
+            return ['ssh', self.remote_config.ip, 'cat', remote_metadata_path]
+        
         cmd = ['rsync']
         
-        # 添加基本参数
-        cmd.extend(['-v'])  # 详细输出
+        # 添加基本参数：本地不保留旧副本，直接整文件传输，跳过增量校验
+        cmd.extend(['--whole-file'])
         
         # 认证配置
         if self.rsync_config.auth_enabled and self.rsync_config.auth_passwordfile:
             cmd.append(f'--password-file={self.rsync_config.auth_passwordfile}')
         
-        # SSH配置
-        if self.rsync_config.ssh_enabled:
-            cmd.extend(['-e', 'ssh'])
-        
-        # 构建远程路径 - 获取远程的元信息文件
-        # 注意：这里需要特殊处理，因为元信息文件不在watch目录内
-        # 我们需要通过特殊的方式获取远程节点的状态文件
-        
-        # 临时方案：通过约定的路径获取
-        remote_metadata_path = f"/var/sersync/bidirectional/{self._get_path_hash()}/state/sync_state.json"
-        
-        if self.rsync_config.ssh_enabled:
-            remote_source = f"{self.remote_config.ip}:{remote_metadata_path}"
-        else:
-            user_prefix = f'{self.rsync_config.auth_users}@' if self.rsync_config.auth_users else ''
-            remote_source = f"{user_prefix}{self.remote_config.ip}::{self.remote_config.name}_metadata/sync_state.json"
+        user_prefix = f'{self.rsync_config.auth_users}@' if self.rsync_config.auth_users else ''
+        remote_source = f"{user_prefix}{self.remote_config.ip}::{self.remote_config.name}_metadata/sync_state.json"
         
         cmd.extend([remote_source, local_path])
         
@@ -235,8 +277,7 @@ class BidirectionalSyncEngine:
     
     def _get_path_hash(self) -> str:
         """获取路径哈希（与MetadataManager保持一致）"""
-        unique_string = f"{self.watch_path}:{self.remote_config.name}"
-        return hashlib.md5(unique_string.encode()).hexdigest()[:8]
+        return self._path_hash
     
     def _create_empty_remote_state(self) -> Dict[str, Any]:
         """创建空的远程状态"""
@@ -258,58 +299,37 @@ class BidirectionalSyncEngine:
         Returns:
             变化列表
         """
-        changes = []
-        
         local_files = local_state.get('files', {})
         remote_files = remote_state.get('files', {})
         
-        # 检查所有文件（本地和远程的并集）
-        all_files = set(local_files.keys()) | set(remote_files.keys())
+        changes = []
         
-        for file_path in all_files:
-            local_info = local_files.get(file_path)
-            remote_info = remote_files.get(file_path)
-            
-            # 检查本地文件实际状态
-            actual_file_path = self.watch_path / file_path
-            file_exists = actual_file_path.exists()
+        # 文件在两边都存在，以 mtime 较新的一边为准（mtime 相同时不视为变化）
+        for file_path in local_files.keys() & remote_files.keys():
+            local_mtime = local_files[file_path].get('mtime', 0)
+            remote_mtime = remote_files[file_path].get('mtime', 0)
             
-            if local_info and remote_info:
-                # 文件在两边都存在，检查是否有变化
-                if self._is_file_modified(local_info, remote_info):
-                    # 检查哪一边更新
-                    local_mtime = local_info.get('mtime', 0)
-                    remote_mtime = remote_info.get('mtime', 0)
-                    
-                    if local_mtime > remote_mtime:
-                        changes.append(FileChange(file_path, 'MODIFY', 'local'))
-                    elif remote_mtime > local_mtime:
-                        changes.append(FileChange(file_path, 'MODIFY', 'remote'))
-                    
-            elif local_info and not remote_info:
-                # 文件只在本地存在
-                if file_exists:
-                    changes.append(FileChange(file_path, 'CREATE', 'local'))
-                else:
-                    # 本地文件已删除，但状态未更新
-                    changes.append(FileChange(file_path, 'DELETE', 'local'))
-                    
-            elif not local_info and remote_info:
-                # 文件只在远程存在
-                changes.append(FileChange(file_path, 'CREATE', 'remote'))
+            if local_mtime > remote_mtime:
+                changes.append(FileChange(file_path, 'MODIFY', 'local'))
+            elif remote_mtime > local_mtime:
+                changes.append(FileChange(file_path, 'MODIFY', 'remote'))
+        
+        # 文件只在本地存在：仅对这部分文件检查实际状态，避免对全部文件 stat
+        for file_path in local_files.keys() - remote_files.keys():
+            if os.path.exists(os.path.join(self._watch_str, file_path)):
+                changes.append(FileChange(file_path, 'CREATE', 'local'))
+            else:
+                # 本地文件已删除，但状态未更新
+                changes.append(FileChange(file_path, 'DELETE', 'local'))
+        
+        # 文件只在远程存在
+        changes.extend(
+            FileChange(file_path, 'CREATE', 'remote')
+            for file_path in remote_files.keys() - local_files.keys()
+        )
         
         return changes
     
-    def _is_file_modified(self, local_info: Dict, remote_info: Dict) -> bool:
-        """检查文件是否被修改"""
-        # 比较修改时间和大小
-        local_mtime = local_info.get('mtime', 0)
-        remote_mtime = remote_info.get('mtime', 0)
-        local_size = local_info.get('size', 0)
-        remote_size = remote_info.get('size', 0)
-        
-        return local_mtime != remote_mtime or local_size != remote_size
-    
     def _detect_conflicts(self, changes: List[FileChange]) -> List[Tuple[FileChange, FileChange, ConflictType]]:
         """
         检测冲突
@@ -322,44 +342,30 @@ class BidirectionalSyncEngine:
         """
         conflicts = []
         
-        # 按文件路径分组变化
-        changes_by_file = {}
+        # 单次遍历按 (路径, 来源) 分桶，每个来源保留第一个变化
+        buckets: Dict[str, Dict[str, FileChange]] = defaultdict(dict)
         for change in changes:
-            if change.file_path not in changes_by_file:
-                changes_by_file[change.file_path] = []
-            changes_by_file[change.file_path].append(change)
-        
-        # 检测每个文件的冲突
-        for file_path, file_changes in changes_by_file.items():
-            if len(file_changes) > 1:
-                # 有多个变化，可能存在冲突
-                local_changes = [c for c in file_changes if c.source == 'local']
-                remote_changes = [c for c in file_changes if c.source == 'remote']
+            buckets[change.file_path].setdefault(change.source, change)
+        
+        # 检测每个文件的冲突（同时有本地和远程变化时才可能冲突）
+        for file_path, by_source in buckets.items():
+            local_change = by_source.get('local')
+            remote_change = by_source.get('remote')
+            if local_change and remote_change:
+                # 确定冲突类型
+                conflict_type = self._determine_conflict_type(local_change, remote_change)
                 
-                if local_changes and remote_changes:
-                    local_change = local_changes[0]
-                    remote_change = remote_changes[0]
-                    
-                    # 确定冲突类型
-                    conflict_type = self._determine_conflict_type(local_change, remote_change)
-                    
-                    if conflict_type != ConflictType.NO_CONFLICT:
-                        conflicts.append((local_change, remote_change, conflict_type))
+                if conflict_type != ConflictType.NO_CONFLICT:
+                    conflicts.append((local_change, remote_change, conflict_type))
         
         return conflicts
     
     def _determine_conflict_type(self, local_change: FileChange, remote_change: FileChange) -> ConflictType:
         """确定冲突类型"""
-        if local_change.change_type == 'MODIFY' and remote_change.change_type == 'MODIFY':
-            return ConflictType.BOTH_MODIFIED
-        elif local_change.change_type == 'DELETE' and remote_change.change_type == 'MODIFY':
-            return ConflictType.LOCAL_DELETED_REMOTE_MODIFIED
-        elif local_change.change_type == 'MODIFY' and remote_change.change_type == 'DELETE':
-            return ConflictType.REMOTE_DELETED_LOCAL_MODIFIED
-        elif local_change.change_type == 'CREATE' and remote_change.change_type == 'CREATE':
-            return ConflictType.BOTH_CREATED
-        else:
-            return ConflictType.NO_CONFLICT
+        return _CONFLICT_TABLE.get(
+            (local_change.change_type, remote_change.change_type),
+            ConflictType.NO_CONFLICT
+        )
     
     async def _resolve_conflicts(self, conflicts: List[Tuple[FileChange, FileChange, ConflictType]]) -> List[FileChange]:
         """
@@ -396,6 +402,14 @@ class BidirectionalSyncEngine:
                     error=str(e)
                 )
         
+        # 一次性批量写入本轮产生的冲突备份
+        if self._pending_backups:
+            pending, self._pending_backups = self._pending_backups, []
+            try:
+                await asyncio.to_thread(self.metadata_manager.copy_conflict_backups, pending)
+            except Exception as e:
+                logger.error("Failed to create conflict backups", count=len(pending), error=str(e))
+        
         return resolved_changes
     
     async def _resolve_single_conflict(
@@ -405,20 +419,12 @@ class BidirectionalSyncEngine:
         conflict_type: ConflictType
     ) -> Optional[List[FileChange]]:
         """解决单个冲突"""
-        
-        if self.conflict_strategy == ConflictResolution.KEEP_NEWER:
-            return await self._resolve_keep_newer(local_change, remote_change)
-        elif self.conflict_strategy == ConflictResolution.KEEP_OLDER:
-            return await self._resolve_keep_older(local_change, remote_change)
-        elif self.conflict_strategy == ConflictResolution.KEEP_LOCAL:
-            return [local_change]
-        elif self.conflict_strategy == ConflictResolution.KEEP_REMOTE:
-            return [remote_change]
-        elif self.conflict_strategy == ConflictResolution.BACKUP_BOTH:
-            return await self._resolve_backup_both(local_change, remote_change)
-        else:
+        handler = self._STRATEGIES.get(self.conflict_strategy)
+        if handler is None:
             logger.warning(f"Unknown conflict strategy: {self.conflict_strategy}")
             return [local_change]  # 默认保留本地
+        
+        return await handler(self, local_change, remote_change)
     
     async def _resolve_keep_newer(self, local_change: FileChange, remote_change: FileChange) -> List[FileChange]:
         """保留较新的文件"""
@@ -436,17 +442,34 @@ class BidirectionalSyncEngine:
         else:
             return [remote_change]
     
+    async def _resolve_keep_local(self, local_change: FileChange, remote_change: FileChange) -> List[FileChange]:
+        """保留本地文件"""
+        return [local_change]
+    
+    async def _resolve_keep_remote(self, local_change: FileChange, remote_change: FileChange) -> List[FileChange]:
+        """保留远程文件"""
+        return [remote_change]
+    
     async def _resolve_backup_both(self, local_change: FileChange, remote_change: FileChange) -> List[FileChange]:
         """备份双方文件"""
-        # 创建冲突备份
-        file_path = self.watch_path / local_change.file_path
-        if file_path.exists():
-            content = file_path.read_bytes()
-            self.metadata_manager.create_conflict_backup(local_change.file_path, content)
+        # 创建冲突备份（由 _resolve_conflicts 统一批量写入）
+        file_path = os.path.join(self._watch_str, local_change.file_path)
+        if os.path.exists(file_path):
+            # 从磁盘文件 reflink/复制备份，无需读入内存
+            self._pending_backups.append((local_change.file_path, file_path))
         
         # 保留远程版本
         return [remote_change]
     
+    # 策略分发表 {策略: 解决方法}
+    _STRATEGIES = {
+        ConflictResolution.KEEP_NEWER: _resolve_keep_newer,
+        ConflictResolution.KEEP_OLDER: _resolve_keep_older,
+        ConflictResolution.KEEP_LOCAL: _resolve_keep_local,
+        ConflictResolution.KEEP_REMOTE: _resolve_keep_remote,
+        ConflictResolution.BACKUP_BOTH: _resolve_backup_both,
+    }
+    
     async def _execute_sync_operations(self, changes: List[FileChange]) -> Dict[str, Any]:
         """
         执行同步操作
@@ -463,30 +486,50 @@ class BidirectionalSyncEngine:
             'operations': []
         }
         
-        for change in changes:
-            try:
-                if change.source == 'local':
-                    # 本地变化，同步到远程
-                    result = await self._sync_local_to_remote(change)
-                else:
-                    # 远程变化，同步到本地
-                    result = await self._sync_remote_to_local(change)
-                
-                if result['success']:
-                    results['files_synced'] += 1
-                else:
-                    results['files_failed'] += 1
-                
-                results['operations'].append(result)
-                
-            except Exception as e:
+        local_changes = [change for change in changes if change.source == 'local']
+        remote_changes = [change for change in changes if change.source != 'local']
+        
+        # 本地变化逐文件推送，传输相互独立，限制并发数后同时执行
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_SYNC_OPERATIONS)
+        
+        async def push_one(change: FileChange) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._sync_local_to_remote(change)
+        
+        # 远程变化合并为一次 rsync 拉取，与本地推送并发进行
+        outcomes, pull_results = await asyncio.gather(
+            asyncio.gather(
+                *(push_one(change) for change in local_changes),
+                return_exceptions=True
+            ),
+            self._sync_remote_to_local(remote_changes)
+        )
+        
+        for change, result in zip(local_changes, outcomes):
+            if isinstance(result, Exception):
                 logger.error(
                     "Sync operation failed",
                     file=change.file_path,
                     source=change.source,
-                    error=str(e)
+                    error=str(result)
                 )
                 results['files_failed'] += 1
+                continue
+            
+            if result['success']:
+                results['files_synced'] += 1
+            else:
+                results['files_failed'] += 1
+            
+            results['operations'].append(result)
+        
+        for result in pull_results:
+            if result['success']:
+                results['files_synced'] += 1
+            else:
+                results['files_failed'] += 1
+            
+            results['operations'].append(result)
         
         return results
     
@@ -505,53 +548,64 @@ class BidirectionalSyncEngine:
             'details': result
         }
     
-    async def _sync_remote_to_local(self, change: FileChange) -> Dict[str, Any]:
-        """同步远程变化到本地"""
-        # 这里需要实现从远程拉取文件的逻辑
-        # 可以使用rsync的拉取模式
+    async def _sync_remote_to_local(self, changes: List[FileChange]) -> List[Dict[str, Any]]:
+        """
+        同步远程变化到本地
         
-        file_path = change.file_path
-        local_file_path = self.watch_path / file_path
+        所有文件通过一次 rsync --files-from 拉取，共用一次连接和协议握手。
+        
+        Args:
+            changes: 远程变化列表
+            
+        Returns:
+            每个文件的同步结果（共享同一次 rsync 的结果）
+        """
+        if not changes:
+            return []
         
         try:
             # 构建rsync拉取命令
-            cmd = self._build_pull_command(file_path)
+            cmd = self._build_pull_command()
             
-            # 执行命令
+            # 执行命令，文件列表通过标准输入传递（NUL 分隔）
             process = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             
-            stdout, stderr = await process.communicate()
-            
-            success = process.returncode == 0
+            file_list = b'\0'.join(change.file_path.encode() for change in changes)
+            stdout, stderr = await process.communicate(file_list)
             
-            return {
-                'file': file_path,
-                'direction': 'remote_to_local',
-                'operation': change.change_type,
-                'success': success,
+            batch_result = {
+                'success': process.returncode == 0,
                 'stdout': stdout.decode(),
                 'stderr': stderr.decode()
             }
             
         except Exception as e:
-            return {
-                'file': file_path,
-                'direction': 'remote_to_local',
-                'operation': change.change_type,
+            batch_result = {
                 'success': False,
                 'error': str(e)
             }
+        
+        return [
+            {
+                'file': change.file_path,
+                'direction': 'remote_to_local',
+                'operation': change.change_type,
+                **batch_result
+            }
+            for change in changes
+        ]
     
-    def _build_pull_command(self, file_path: str) -> List[str]:
-        """构建从远程拉取文件的rsync命令"""
+    def _build_pull_command(self) -> List[str]:
+        """构建从远程批量拉取文件的rsync命令（文件列表从标准输入读取）"""
         cmd = ['rsync']
         
         # 基本参数
-        cmd.extend(['-avz'])
+        cmd.extend(['-avz', '--files-from=-', '--from0'])
         
         # 认证
         if self.rsync_config.auth_enabled and self.rsync_config.auth_passwordfile:
@@ -561,36 +615,46 @@ class BidirectionalSyncEngine:
         if self.rsync_config.ssh_enabled:
             cmd.extend(['-e', 'ssh'])
         
-        # 构建远程源路径和本地目标路径
+        # 构建远程源目录和本地目标目录（列表中的路径相对于两者）
         if self.rsync_config.ssh_enabled:
-            remote_source = f"{self.remote_config.ip}:{self.remote_config.name}/{file_path}"
+            remote_source = f"{self.remote_config.ip}:{self.remote_config.name}/"
         else:
             user_prefix = f'{self.rsync_config.auth_users}@' if self.rsync_config.auth_users else ''
-            remote_source = f"{user_prefix}{self.remote_config.ip}::{self.remote_config.name}/{file_path}"
+            remote_source = f"{user_prefix}{self.remote_config.ip}::{self.remote_config.name}/"
         
-        local_target = str(self.watch_path / file_path)
+        local_target = os.path.join(self._watch_str, '')
         
         cmd.extend([remote_source, local_target])
         
         return cmd
     
     async def _update_local_state(self, changes: List[FileChange]):
-        """更新本地状态"""
+        """更新本地状态（stat 和日志写入在线程中执行，不阻塞事件循环）"""
+        await asyncio.to_thread(self._apply_local_state, changes)
+    
+    def _apply_local_state(self, changes: List[FileChange]):
+        """根据本地文件实际状态批量更新元信息"""
+        to_update = []
+        to_remove = []
+        
         for change in changes:
             file_path = change.file_path
-            actual_file_path = self.watch_path / file_path
             
-            if actual_file_path.exists():
-                # 文件存在，更新状态
-                stat = actual_file_path.stat()
-                self.metadata_manager.update_file_state(
-                    file_path=file_path,
-                    mtime=stat.st_mtime,
-                    size=stat.st_size
-                )
-            else:
+            # 单次 stat 同时判断存在性并获取统计信息
+            try:
+                stat = os.stat(os.path.join(self._watch_str, file_path))
+            except FileNotFoundError:
                 # 文件不存在，移除状态
-                self.metadata_manager.remove_file_state(file_path)
+                to_remove.append(file_path)
+                continue
+            
+            # 文件存在，更新状态
+            to_update.append((file_path, stat.st_mtime, stat.st_size))
+        
+        # 批量写入状态，每批只加锁和追加日志一次；本轮结束时日志落盘
+        self.metadata_manager.bulk_update_file_states(to_update)
+        self.metadata_manager.bulk_remove_file_states(to_remove)
+        self.metadata_manager.sync_journal()
     
     def get_stats(self) -> Dict[str, Any]:
         """获取同步统计信息"""
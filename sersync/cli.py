@@ -4,43 +4,83 @@ Sersync CLI Entry Point
 
 import sys
 import logging
-import asyncio
-import platform
 import click
 import structlog
-from pathlib import Path
 
-# 修复 Python 3.12 在 Linux 上的 asyncio 子进程问题
-if sys.version_info >= (3, 12) and platform.system() == 'Linux':
-    try:
-        # 在 Python 3.12+ 中，默认的事件循环策略可能不支持子进程
-        # 设置为 ThreadedChildWatcher 来解决这个问题
-        if hasattr(asyncio, 'ThreadedChildWatcher'):
-            asyncio.set_child_watcher(asyncio.ThreadedChildWatcher())
-        elif hasattr(asyncio, 'PidfdChildWatcher'):
-            # 如果系统支持 pidfd，使用 PidfdChildWatcher
-            asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
-        else:
-            # 回退到 ThreadedChildWatcher
-            asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
-    except (AttributeError, NotImplementedError):
-        # 如果上述方法都不可用，设置默认策略
-        asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
-
-# 配置 structlog
-structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.dev.ConsoleRenderer() if sys.stderr.isatty() else structlog.processors.JSONRenderer(),
-    ],
-    wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
-    context_class=dict,
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=True,
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 日志级别名称 -> logging 级别
+LOG_LEVEL_MAP = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+}
+
+# 可选的冲突解决策略（与 ResolutionStrategy 的枚举值一致）
+CONFLICT_STRATEGIES = (
+    'keep_newer', 'keep_older', 'keep_local', 'keep_remote', 'backup_both', 'manual', 'skip',
 )
 
+
+def configure_logging(log_level: str = 'INFO'):
+    """
+    配置 structlog（每个进程只调用一次）
+
+    日志级别在配置时确定，之后不再重新配置，避免已缓存的 logger 失效。
+
+    Args:
+        log_level: 日志级别 (DEBUG, INFO, WARNING, ERROR)
+    """
+    if sys.stderr.isatty():
+        renderer = structlog.dev.ConsoleRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
+    elif ORJSON_AVAILABLE:
+        # 非终端输出：orjson 直接生成字节，BytesLogger 写入时无需再编码
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        logger_factory = structlog.BytesLoggerFactory()
+    else:
+        renderer = structlog.processors.JSONRenderer()
+        logger_factory = structlog.PrintLoggerFactory()
+
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            renderer,
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(
+            LOG_LEVEL_MAP.get(log_level.upper(), logging.INFO)
+        ),
+        context_class=dict,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
+
+
+def install_uvloop() -> bool:
+    """
+    可用时使用 uvloop 作为 asyncio 事件循环
+
+    uvloop 不支持 Windows，未安装时保持默认事件循环。
+
+    Returns:
+        是否已启用 uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    import asyncio
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 logger = structlog.get_logger()
 
 
@@ -113,7 +153,7 @@ logger = structlog.get_logger()
 @click.option(
     '--conflict-strategy',
     default='keep_newer',
-    type=click.Choice(['keep_newer', 'keep_older', 'keep_local', 'keep_remote', 'backup_both', 'manual', 'skip'], case_sensitive=False),
+    type=click.Choice(CONFLICT_STRATEGIES, case_sensitive=False),
     help='冲突解决策略 [默认: keep_newer]'
 )
 @click.option(
@@ -170,27 +210,22 @@ def main(
     sersync -m refreshCDN -o /etc/sersync.xml
     """
 
-    # 配置日志级别
-    import logging
-    log_level_map = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'ERROR': logging.ERROR,
-    }
-    structlog.configure(
-        wrapper_class=structlog.make_filtering_bound_logger(log_level_map[log_level])
-    )
+    # 在输出任何日志之前一次性配置日志系统
+    configure_logging(log_level)
 
-    logger.info(
-        "Sersync starting",
-        version="0.1.0",
-        config=config,
-        daemon=daemon,
-        threads=threads,
-        web=web,
-        bidirectional=bidirectional,
-    )
+    # 日志级别高于 INFO 时跳过多字段启动日志的参数构造
+    info_enabled = logger.is_enabled_for(logging.INFO)
+
+    if info_enabled:
+        logger.info(
+            "Sersync starting",
+            version="0.1.0",
+            config=config,
+            daemon=daemon,
+            threads=threads,
+            web=web,
+            bidirectional=bidirectional,
+        )
 
     try:
         # 加载配置
@@ -223,12 +258,13 @@ def main(
                 if bidir_root:
                     sersync_config.bidirectional.remote_root = bidir_root
                 sersync_config.bidirectional.conflict_strategy = conflict_strategy
-                logger.info(
-                    "Bidirectional sync enabled via CLI",
-                    remote_host=bidir_host,
-                    remote_root=bidir_root,
-                    conflict_strategy=conflict_strategy
-                )
+                if info_enabled:
+                    logger.info(
+                        "Bidirectional sync enabled via CLI",
+                        remote_host=bidir_host,
+                        remote_root=bidir_root,
+                        conflict_strategy=conflict_strategy
+                    )
             else:
                 logger.error("Bidirectional sync requires --bidir-host")
                 sys.exit(1)
@@ -246,7 +282,11 @@ def main(
             from sersync.utils.daemon import daemonize
             daemonize()
 
-        # 启动核心引擎
+        # 启动核心引擎（以下各分支共用 asyncio，仅在此处导入一次）
+        import asyncio
+        uvloop_enabled = install_uvloop()
+        logger.debug("Event loop configured", uvloop=uvloop_enabled)
+
         from sersync.core.engine import SersyncEngine, set_engine_instance
         engine = SersyncEngine(sersync_config, threads=threads)
         set_engine_instance(engine)
@@ -257,20 +297,8 @@ def main(
             logger.info("Initializing bidirectional sync coordinator")
             from sersync.bidirectional import BidirectionalCoordinator, ResolutionStrategy
 
-            # 将字符串策略转换为枚举
-            strategy_map = {
-                "keep_newer": ResolutionStrategy.KEEP_NEWER,
-                "keep_older": ResolutionStrategy.KEEP_OLDER,
-                "keep_local": ResolutionStrategy.KEEP_LOCAL,
-                "keep_remote": ResolutionStrategy.KEEP_REMOTE,
-                "backup_both": ResolutionStrategy.BACKUP_BOTH,
-                "manual": ResolutionStrategy.MANUAL,
-                "skip": ResolutionStrategy.SKIP,
-            }
-            strategy = strategy_map.get(
-                sersync_config.bidirectional.conflict_strategy,
-                ResolutionStrategy.KEEP_NEWER
-            )
+            # 命令行选项已由 click.Choice 校验，直接按枚举值转换
+            strategy = ResolutionStrategy(sersync_config.bidirectional.conflict_strategy)
 
             bidirectional_coordinator = BidirectionalCoordinator(
                 local_root=sersync_config.watch_path,
@@ -284,26 +312,25 @@ def main(
                 ignore_patterns=sersync_config.bidirectional.ignore_patterns
             )
 
-            logger.info(
-                "Bidirectional coordinator initialized",
-                remote_host=sersync_config.bidirectional.remote_host,
-                strategy=strategy.value
-            )
+            if info_enabled:
+                logger.info(
+                    "Bidirectional coordinator initialized",
+                    remote_host=sersync_config.bidirectional.remote_host,
+                    strategy=strategy.value
+                )
 
         # 初始全量同步
         if initial_sync:
             logger.info("Performing initial full sync")
-            import asyncio
             asyncio.run(engine.full_sync())
 
         # 启动 Web 界面（如果启用）
-        if web or sersync_config.web.enabled:
+        web_server = None
+        if web or (sersync_config.web and sersync_config.web.enabled):
             actual_port = web_port if web else sersync_config.web.port
             logger.info("Starting Web dashboard", port=actual_port)
 
-            from sersync.web import create_app, setup_engine_integration
-            import uvicorn
-            import threading
+            from sersync.web import create_app, create_server, setup_engine_integration
 
             # 创建 Web 应用
             app = create_app(enable_auth=True)
@@ -311,48 +338,88 @@ def main(
             # 连接引擎和 WebSocket
             setup_engine_integration(app)
 
-            # 在后台线程启动 Web 服务器
-            web_thread = threading.Thread(
-                target=lambda: uvicorn.run(app, host='0.0.0.0', port=actual_port, log_level="error"),
-                daemon=True
-            )
-            web_thread.start()
+            # Web 服务与引擎共用同一个事件循环，随引擎一起启动
+            web_server = create_server(app, host='0.0.0.0', port=actual_port)
+
+        async def serve_web():
+            try:
+                await web_server.serve()
+            except SystemExit:
+                # 端口占用等启动失败时 uvicorn 会调用 sys.exit，不能影响同步引擎
+                logger.error("Web dashboard failed to start", port=actual_port)
+
+        async def run_with_web(engine_coro):
+            """运行引擎，Web 服务（如启用）在同一事件循环中并行运行"""
+            if web_server is None:
+                await engine_coro
+                return
+
+            web_task = asyncio.create_task(serve_web())
             logger.info("Web dashboard started", port=actual_port, url=f"http://localhost:{actual_port}")
+            try:
+                await engine_coro
+            finally:
+                # 引擎退出后通知 Web 服务关闭，超时则直接取消
+                web_server.should_exit = True
+                done, _ = await asyncio.wait({web_task}, timeout=5)
+                if not done:
+                    web_task.cancel()
 
         # 启动双向同步协调器（如果启用）
         if bidirectional_coordinator:
             logger.info("Starting bidirectional sync coordinator")
-            import asyncio
 
             async def run_with_bidirectional():
+                from sersync.bidirectional.coordinator import EVENT_QUEUE_MAXSIZE
+
                 # 启动协调器
                 await bidirectional_coordinator.start()
 
+                # 本地事件经有界队列交给单个转发任务，避免每个事件创建一个 Task
+                loop = asyncio.get_running_loop()
+                forward_queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+
+                async def forward_local_events():
+                    while True:
+                        event_type, file_path = await forward_queue.get()
+                        try:
+                            await bidirectional_coordinator.on_local_event(event_type, file_path)
+                        except Exception as e:
+                            logger.error("Failed to forward local event", path=file_path, error=str(e))
+
+                def enqueue_local_event(event_type: str, file_path: str):
+                    try:
+                        forward_queue.put_nowait((event_type, file_path))
+                    except asyncio.QueueFull:
+                        logger.warning("Bidirectional event queue full, event dropped", path=file_path)
+
+                forwarder = asyncio.create_task(forward_local_events())
+
                 # 将本地事件转发到协调器
                 original_on_event = engine._on_file_event
 
                 def on_file_event_with_bidir(event_type: str, file_path: str, **kwargs):
                     # 调用原始处理器
                     original_on_event(event_type, file_path, **kwargs)
-                    # 转发到双向协调器
-                    asyncio.create_task(
-                        bidirectional_coordinator.on_local_event(event_type, file_path)
-                    )
+                    # 转发到双向协调器（watchdog 后端在观察者线程中回调）
+                    loop.call_soon_threadsafe(enqueue_local_event, event_type, file_path)
 
                 engine._on_file_event = on_file_event_with_bidir
+                # 监控器在初始化时已绑定原回调，需要一并替换
+                engine.monitor.handler.callback = on_file_event_with_bidir
 
                 # 启动引擎
                 await engine.start()
 
-                # 停止协调器
+                # 停止转发任务和协调器
+                forwarder.cancel()
                 await bidirectional_coordinator.stop()
 
-            asyncio.run(run_with_bidirectional())
+            asyncio.run(run_with_web(run_with_bidirectional()))
         else:
             # 启动实时监控（常规模式）
             logger.info("Starting real-time monitoring")
-            import asyncio
-            asyncio.run(engine.start())
+            asyncio.run(run_with_web(engine.start()))
 
     except KeyboardInterrupt:
         logger.info("Received shutdown signal, stopping...")
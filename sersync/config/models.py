@@ -2,18 +2,30 @@
 配置数据模型
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from functools import partial
+from typing import TYPE_CHECKING, List, Optional, Dict
 
+if TYPE_CHECKING:
+    from sersync.bidirectional.sync_engine import ConflictResolution
 
-@dataclass
+# Python 3.10+ 使用 __slots__ 生成配置类（无实例 __dict__，属性访问更快）；
+# 3.9 不支持 slots 参数，退回普通 dataclass
+if sys.version_info >= (3, 10):
+    config_dataclass = partial(dataclass, slots=True)
+else:
+    config_dataclass = dataclass
+
+
+@config_dataclass
 class HostConfig:
     """主机配置"""
     hostip: str
     port: int
 
 
-@dataclass
+@config_dataclass
 class RemoteConfig:
     """远程目标配置"""
     ip: str
@@ -30,8 +42,11 @@ class RemoteConfig:
     conflict_backup_dir: Optional[str] = None
     lock_file: Optional[str] = None
 
+    # 解析时由 conflict_strategy 转换得到的枚举（仅双向模式）
+    resolved_strategy: Optional["ConflictResolution"] = None
 
-@dataclass
+
+@config_dataclass
 class RsyncConfig:
     """Rsync 配置"""
     common_params: str = "-artuz"
@@ -45,7 +60,7 @@ class RsyncConfig:
     ssh_enabled: bool = False
 
 
-@dataclass
+@config_dataclass
 class InotifyConfig:
     """Inotify 事件配置"""
     delete: bool = True
@@ -58,21 +73,21 @@ class InotifyConfig:
     modify: bool = False
 
 
-@dataclass
+@config_dataclass
 class FilterConfig:
     """过滤配置"""
     enabled: bool = False
     patterns: List[str] = field(default_factory=list)
 
 
-@dataclass
+@config_dataclass
 class FailLogConfig:
     """失败日志配置"""
     path: str = "/tmp/rsync_fail_log.sh"
     time_to_execute: int = 60  # seconds
 
 
-@dataclass
+@config_dataclass
 class CrontabConfig:
     """定期全量同步配置"""
     enabled: bool = False
@@ -80,7 +95,7 @@ class CrontabConfig:
     filter: Optional[FilterConfig] = None
 
 
-@dataclass
+@config_dataclass
 class PluginConfig:
     """插件配置"""
     name: str  # 必须参数放在前面
@@ -88,7 +103,7 @@ class PluginConfig:
     params: Dict = field(default_factory=dict)
 
 
-@dataclass
+@config_dataclass
 class NotificationConfig:
     """通知配置"""
     enabled: bool = False
@@ -97,7 +112,7 @@ class NotificationConfig:
     templates: Dict[str, Dict] = field(default_factory=dict)
 
 
-@dataclass
+@config_dataclass
 class WebConfig:
     """Web 界面配置"""
     enabled: bool = False
@@ -106,7 +121,7 @@ class WebConfig:
     users: List[Dict] = field(default_factory=list)
 
 
-@dataclass
+@config_dataclass
 class DatabaseConfig:
     """数据库配置"""
     enabled: bool = True
@@ -117,7 +132,7 @@ class DatabaseConfig:
     max_records: int = 100000  # 最大记录数，超过时自动清理最旧的记录
 
 
-@dataclass
+@config_dataclass
 class LoggingConfig:
     """日志配置"""
     level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
@@ -129,7 +144,7 @@ class LoggingConfig:
     console_enabled: bool = True
 
 
-@dataclass
+@config_dataclass
 class BidirectionalConfig:
     """双向同步全局配置"""
     enabled: bool = False
@@ -139,8 +154,18 @@ class BidirectionalConfig:
     enable_conflict_backup: bool = True
     max_conflict_backups: int = 10  # 最大冲突备份数量
 
+    # 命令行 --bidirectional 覆盖的运行参数
+    remote_host: Optional[str] = None
+    remote_root: Optional[str] = None
+    remote_user: Optional[str] = None
+    ssh_port: int = 22
+    conflict_strategy: str = "keep_newer"
+    sync_interval: int = 60
+    enable_unison: bool = True
+    ignore_patterns: List[str] = field(default_factory=list)
+
 
-@dataclass
+@config_dataclass
 class SersyncConfig:
     """Sersync 主配置"""
     version: str
@@ -155,8 +180,9 @@ class SersyncConfig:
     fail_log: FailLogConfig
     crontab: CrontabConfig
     plugins: List[PluginConfig]
-    notification: NotificationConfig = field(default_factory=lambda: NotificationConfig())
-    web: WebConfig = field(default_factory=lambda: WebConfig())
+    # 以下两节未配置时为 None（表示未启用），不构造默认对象
+    notification: Optional[NotificationConfig] = None
+    web: Optional[WebConfig] = None
     bidirectional: BidirectionalConfig = field(default_factory=lambda: BidirectionalConfig())
     database: DatabaseConfig = field(default_factory=lambda: DatabaseConfig())
     logging: LoggingConfig = field(default_factory=lambda: LoggingConfig())
@@ -2,9 +2,10 @@
 XML 配置文件解析器
 """
 
+import itertools
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import structlog
 
 from sersync.config.models import (
@@ -26,6 +27,46 @@ from sersync.config.models import (
 
 logger = structlog.get_logger()
 
+DEFAULT_APPRISE_CONFIG = '/etc/sersync/apprise.yml'
+
+# notification/rules/rule 节点的属性默认值
+RULE_DEFAULTS = {
+    'event': '',
+    'notify': 'immediate',
+    'tags': '',
+    'batch_size': 100,
+    'batch_interval': 600,
+    'cron': '0 9 * * *',
+}
+
+
+# 视为真的布尔属性取值：'true' 的全部大小写组合，与 value.lower() == 'true' 等价，
+# 集合查找无需 lower() 生成新字符串
+TRUE_VALUES = frozenset(''.join(chars) for chars in itertools.product(*zip('true', 'TRUE')))
+
+# 子节点缺失时使用的空属性表（只读）
+_EMPTY_ATTRIB: Dict[str, str] = {}
+
+
+def _attrib_of(node) -> Dict[str, str]:
+    """返回节点属性表，节点不存在时返回空表"""
+    return _EMPTY_ATTRIB if node is None else node.attrib
+
+
+def _resolve_strategy(enum_cls, value: str, where: str):
+    """按枚举值转换冲突策略，无效值在解析阶段直接报错"""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        choices = ', '.join(member.value for member in enum_cls)
+        raise ValueError(f"{where} 的冲突策略 '{value}' 无效，可选值: {choices}") from None
+
+
+def _int_attr(attrib: Dict[str, str], key: str, default: int) -> int:
+    """读取整数属性，缺省时直接返回默认值（不再对默认值做 int 转换）"""
+    value = attrib.get(key)
+    return default if value is None else int(value)
+
 
 class ConfigParser:
     """XML 配置文件解析器"""
@@ -42,20 +83,28 @@ class ConfigParser:
         """
         logger.info("Parsing configuration", path=config_path)
 
-        tree = ET.parse(config_path)
-        root = tree.getroot()
+        root = ET.parse(config_path).getroot()
+
+        # 单次遍历根节点子元素，按标签分组，避免逐个 find() 线性扫描
+        sections: Dict[str, ET.Element] = {}
+        plugin_nodes: List[ET.Element] = []
+        for child in root:
+            if child.tag == 'plugin':
+                plugin_nodes.append(child)
+            else:
+                sections.setdefault(child.tag, child)
 
         # 解析各个配置节点
         version = root.attrib.get('version', '2.5')
 
-        host = self._parse_host(root.find('host'))
-        debug = self._parse_bool(root.find('debug'))
-        xfs = self._parse_bool(root.find('fileSystem'), attr='xfs')
-        filter_config = self._parse_filter(root.find('filter'))
-        inotify = self._parse_inotify(root.find('inotify'))
+        host = self._parse_host(sections.get('host'))
+        debug = self._parse_bool(sections.get('debug'))
+        xfs = self._parse_bool(sections.get('fileSystem'), attr='xfs')
+        filter_config = self._parse_filter(sections.get('filter'))
+        inotify = self._parse_inotify(sections.get('inotify'))
 
         # 解析 sersync 节点
-        sersync_node = root.find('sersync')
+        sersync_node = sections.get('sersync')
         localpath = sersync_node.find('localpath')
         watch_path = localpath.attrib.get('watch', '/')
         remotes = self._parse_remotes(localpath.findall('remote'))
@@ -63,14 +112,14 @@ class ConfigParser:
         rsync = self._parse_rsync(sersync_node.find('rsync'))
         fail_log = self._parse_fail_log(sersync_node.find('failLog'))
         crontab = self._parse_crontab(sersync_node.find('crontab'))
-        plugins = self._parse_plugins(root.findall('plugin'))
+        plugins = self._parse_plugins(plugin_nodes)
 
         # 扩展配置（可选）
-        notification = self._parse_notification(root.find('notification'))
-        web = self._parse_web(root.find('web'))
-        bidirectional = self._parse_bidirectional(root.find('bidirectional'))
-        database = self._parse_database(root.find('database'))
-        logging_config = self._parse_logging(root.find('logging'))
+        notification = self._parse_notification(sections.get('notification'))
+        web = self._parse_web(sections.get('web'))
+        bidirectional = self._parse_bidirectional(sections.get('bidirectional'))
+        database = self._parse_database(sections.get('database'))
+        logging_config = self._parse_logging(sections.get('logging'))
 
         config = SersyncConfig(
             version=version,
@@ -97,17 +146,18 @@ class ConfigParser:
 
     def _parse_host(self, node) -> HostConfig:
         """解析 host 节点"""
+        attrib = node.attrib
         return HostConfig(
-            hostip=node.attrib.get('hostip', 'localhost'),
-            port=int(node.attrib.get('port', 8008))
+            hostip=attrib.get('hostip', 'localhost'),
+            port=_int_attr(attrib, 'port', 8008)
         )
 
     def _parse_bool(self, node, attr='start', default=False) -> bool:
         """解析布尔值"""
         if node is None:
             return default
-        value = node.attrib.get(attr, 'false' if not default else 'true')
-        return value.lower() == 'true'
+        value = node.attrib.get(attr)
+        return default if value is None else value in TRUE_VALUES
 
     def _parse_filter(self, node) -> FilterConfig:
         """解析 filter 节点"""
@@ -144,17 +194,23 @@ class ConfigParser:
         
         for node in nodes:
             # 基本配置
+            attrib = node.attrib
             remote = RemoteConfig(
-                ip=node.attrib.get('ip', ''),
-                name=node.attrib.get('name', ''),
-                mode=node.attrib.get('mode', 'unidirectional'),
-                node_id=node.attrib.get('node_id'),
-                conflict_strategy=node.attrib.get('conflict_strategy', 'keep_newer'),
-                sync_interval=int(node.attrib.get('sync_interval', '60'))
+                ip=attrib.get('ip', ''),
+                name=attrib.get('name', ''),
+                mode=attrib.get('mode', 'unidirectional'),
+                node_id=attrib.get('node_id'),
+                conflict_strategy=attrib.get('conflict_strategy', 'keep_newer'),
+                sync_interval=_int_attr(attrib, 'sync_interval', 60)
             )
             
             # 解析双向同步的元信息配置
             if remote.mode == 'bidirectional':
+                from sersync.bidirectional.sync_engine import ConflictResolution
+                remote.resolved_strategy = _resolve_strategy(
+                    ConflictResolution, remote.conflict_strategy, f"remote {remote.ip}::{remote.name}"
+                )
+
                 metadata_node = node.find('metadata')
                 if metadata_node is not None:
                     remote.metadata_dir = metadata_node.get('sync_state_dir')
@@ -170,22 +226,22 @@ class ConfigParser:
         if node is None:
             return RsyncConfig()
 
-        common_params = node.find('commonParams')
         auth = node.find('auth')
         port = node.find('userDefinedPort')
         timeout = node.find('timeout')
-        ssh = node.find('ssh')
+        auth_attrib = _attrib_of(auth)
 
+        # _parse_bool 对缺失节点返回 False，无需逐项判空
         return RsyncConfig(
-            common_params=common_params.attrib.get('params', '-artuz') if common_params is not None else '-artuz',
-            auth_enabled=self._parse_bool(auth) if auth is not None else False,
-            auth_users=auth.attrib.get('users', None) if auth is not None else None,
-            auth_passwordfile=auth.attrib.get('passwordfile', None) if auth is not None else None,
-            custom_port_enabled=self._parse_bool(port) if port is not None else False,
-            custom_port=int(port.attrib.get('port', 874)) if port is not None else 874,
-            timeout_enabled=self._parse_bool(timeout) if timeout is not None else False,
-            timeout=int(timeout.attrib.get('time', 100)) if timeout is not None else 100,
-            ssh_enabled=self._parse_bool(ssh) if ssh is not None else False,
+            common_params=_attrib_of(node.find('commonParams')).get('params', '-artuz'),
+            auth_enabled=self._parse_bool(auth),
+            auth_users=auth_attrib.get('users'),
+            auth_passwordfile=auth_attrib.get('passwordfile'),
+            custom_port_enabled=self._parse_bool(port),
+            custom_port=_int_attr(_attrib_of(port), 'port', 874),
+            timeout_enabled=self._parse_bool(timeout),
+            timeout=_int_attr(_attrib_of(timeout), 'time', 100),
+            ssh_enabled=self._parse_bool(node.find('ssh')),
         )
 
     def _parse_fail_log(self, node) -> FailLogConfig:
@@ -195,7 +251,7 @@ class ConfigParser:
 
         return FailLogConfig(
             path=node.attrib.get('path', '/tmp/rsync_fail_log.sh'),
-            time_to_execute=int(node.attrib.get('timeToExecute', 60))
+            time_to_execute=_int_attr(node.attrib, 'timeToExecute', 60)
         )
 
     def _parse_crontab(self, node) -> CrontabConfig:
@@ -204,7 +260,7 @@ class ConfigParser:
             return CrontabConfig()
 
         enabled = self._parse_bool(node)
-        schedule = int(node.attrib.get('schedule', 600))
+        schedule = _int_attr(node.attrib, 'schedule', 600)
 
         filter_node = node.find('crontabfilter')
         cron_filter = self._parse_filter(filter_node) if filter_node is not None else None
@@ -221,15 +277,27 @@ class ConfigParser:
             PluginConfig(
                 enabled=self._parse_bool(node),
                 name=node.attrib.get('name', ''),
-                params={}  # TODO: 解析插件参数
+                params=self._parse_plugin_params(node)
             )
             for node in nodes
         ]
 
-    def _parse_notification(self, node) -> NotificationConfig:
-        """解析 notification 节点（扩展功能）"""
+    def _parse_plugin_params(self, node) -> Dict:
+        """
+        解析插件参数
+
+        插件节点自身的属性（name/start 除外）直接作为参数，
+        子节点（如 <param prefix="/bin/sh"/>）以标签名为键保存其属性。
+        """
+        params = {key: value for key, value in node.items() if key not in ('name', 'start')}
+        for child in node:
+            params[child.tag] = dict(child.items())
+        return params
+
+    def _parse_notification(self, node) -> Optional[NotificationConfig]:
+        """解析 notification 节点（扩展功能），未配置时返回 None"""
         if node is None:
-            return NotificationConfig()
+            return None
 
         enabled = self._parse_bool(node.find('enabled'))
         apprise_config = node.find('apprise_config')
@@ -239,14 +307,11 @@ class ConfigParser:
         rules_node = node.find('rules')
         if rules_node is not None:
             for rule_node in rules_node.findall('rule'):
-                rule = {
-                    'event': rule_node.attrib.get('event', ''),
-                    'notify': rule_node.attrib.get('notify', 'immediate'),
-                    'tags': rule_node.attrib.get('tags', '').split(','),
-                    'batch_size': int(rule_node.attrib.get('batch_size', 100)),
-                    'batch_interval': int(rule_node.attrib.get('batch_interval', 600)),
-                    'cron': rule_node.attrib.get('cron', '0 9 * * *'),
-                }
+                attrib = rule_node.attrib
+                rule = {key: attrib.get(key, default) for key, default in RULE_DEFAULTS.items()}
+                rule['tags'] = rule['tags'].split(',')
+                rule['batch_size'] = _int_attr(attrib, 'batch_size', RULE_DEFAULTS['batch_size'])
+                rule['batch_interval'] = _int_attr(attrib, 'batch_interval', RULE_DEFAULTS['batch_interval'])
                 rules.append(rule)
 
         # 解析模板
@@ -265,18 +330,18 @@ class ConfigParser:
 
         return NotificationConfig(
             enabled=enabled,
-            apprise_config=apprise_config.attrib.get('path', '/etc/sersync/apprise.yml') if apprise_config is not None else '/etc/sersync/apprise.yml',
+            apprise_config=apprise_config.attrib.get('path', DEFAULT_APPRISE_CONFIG) if apprise_config is not None else DEFAULT_APPRISE_CONFIG,
             rules=rules,
             templates=templates
         )
 
-    def _parse_web(self, node) -> WebConfig:
-        """解析 web 节点（扩展功能）"""
+    def _parse_web(self, node) -> Optional[WebConfig]:
+        """解析 web 节点（扩展功能），未配置时返回 None"""
         if node is None:
-            return WebConfig()
+            return None
 
         enabled = self._parse_bool(node)
-        port = int(node.attrib.get('port', 8000))
+        port = _int_attr(node.attrib, 'port', 8000)
 
         return WebConfig(
             enabled=enabled,
@@ -291,11 +356,14 @@ class ConfigParser:
         enabled = self._parse_bool(node)
         
         # 解析全局双向同步配置
-        default_conflict_strategy = node.attrib.get('default_conflict_strategy', 'keep_newer')
-        default_sync_interval = int(node.attrib.get('default_sync_interval', '60'))
-        metadata_base_dir = node.attrib.get('metadata_base_dir', '/var/sersync/bidirectional')
-        enable_conflict_backup = node.attrib.get('enable_conflict_backup', 'true').lower() == 'true'
-        max_conflict_backups = int(node.attrib.get('max_conflict_backups', '10'))
+        attrib = node.attrib
+        default_conflict_strategy = attrib.get('default_conflict_strategy', 'keep_newer')
+        from sersync.bidirectional.conflict_resolver import ResolutionStrategy
+        _resolve_strategy(ResolutionStrategy, default_conflict_strategy, "bidirectional")
+        default_sync_interval = _int_attr(attrib, 'default_sync_interval', 60)
+        metadata_base_dir = attrib.get('metadata_base_dir', '/var/sersync/bidirectional')
+        enable_conflict_backup = attrib.get('enable_conflict_backup', 'true') in TRUE_VALUES
+        max_conflict_backups = _int_attr(attrib, 'max_conflict_backups', 10)
 
         return BidirectionalConfig(
             enabled=enabled,
@@ -11,6 +11,8 @@ Sersync 主引擎
 """
 
 import asyncio
+import time
+from collections import deque
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
@@ -22,8 +24,30 @@ from sersync.core.event_queue import EventQueue
 from sersync.core.filter import FileFilter
 from sersync.core.sync_engine import SyncEngine
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+# 同步日志批量写入数据库：攒够一批或等待一个窗口后在单个事务中提交
+DB_LOG_QUEUE_MAXSIZE = 10_000
+DB_LOG_BATCH_SIZE = 128
+DB_LOG_FLUSH_INTERVAL = 0.2  # 秒
+
+# 系统指标写入数据库的间隔
+METRIC_RECORD_INTERVAL = 30  # 秒
+
+
+class _ZeroUsage:
+    """psutil 不可用时的占位使用率"""
+    percent = 0
+
+
+_ZERO_USAGE = _ZeroUsage()
+
 
 class SersyncEngine:
     """Sersync 主引擎"""
@@ -41,6 +65,14 @@ class SersyncEngine:
         self._running = False
         self._tasks = []
         self._loop = None  # 保存事件循环引用
+        self._start_monotonic = None  # 运行时间基准（单调时钟）
+
+        # 监控回调 -> 事件循环的事件通道，由单个 ingest 任务消费
+        self._ingest_deque = deque()
+        self._ingest_wakeup: Optional[asyncio.Event] = None
+
+        # 待写入数据库的同步日志（启用数据库时在 start() 中创建）
+        self._db_log_queue: Optional[asyncio.Queue] = None
 
         # 初始化各个模块
         self.monitor = FileMonitor(
@@ -64,15 +96,25 @@ class SersyncEngine:
             fail_log=config.fail_log
         )
 
+        # 同步结果中的远程标识（ip::module）预先解析，避免每个事件重复 split
+        self._remote_parse_cache = {
+            f"{remote.ip}::{remote.name}": (remote.ip, remote.name)
+            for remote in config.remotes
+        }
+        self._remotes_count = len(config.remotes)
+
         # 初始化双向同步引擎
         self.bidirectional_engines = {}
         self._setup_bidirectional_sync(config)
 
         # 初始化数据库（如果启用）
+        self._db = None
         if config.database.enabled:
             try:
                 from sersync.web.config_manager import set_web_config
+                from sersync.web.database import get_db_manager
                 set_web_config(config)
+                self._db = get_db_manager()
                 logger.info("Database configured", path=config.database.path)
             except Exception as e:
                 logger.error("Failed to configure database", error=str(e))
@@ -80,7 +122,7 @@ class SersyncEngine:
         # 初始化通知系统
         self.notifier = None
         self.notification_engine = None
-        if config.notification.enabled:
+        if config.notification and config.notification.enabled:
             self._setup_notification(config)
 
         # 初始化 FailLog 执行器
@@ -112,7 +154,7 @@ class SersyncEngine:
             remotes=len(config.remotes),
             threads=threads,
             debug=config.debug,
-            notification_enabled=config.notification.enabled
+            notification_enabled=config.notification is not None and config.notification.enabled
         )
 
     def set_web_broadcast_callback(self, callback):
@@ -125,23 +167,27 @@ class SersyncEngine:
         self.web_broadcast_callback = callback
         logger.info("Web broadcast callback registered")
 
-    async def _broadcast_to_web(self, message_type: str, data: dict):
+    async def _broadcast_to_web(self, message_type: str, data: dict, timestamp: Optional[str] = None):
         """
         向 Web 客户端广播消息
 
         Args:
             message_type: 消息类型 (status/event/metrics)
             data: 消息数据
+            timestamp: ISO 格式时间戳（默认取当前时间）
         """
-        if self.web_broadcast_callback:
-            try:
-                await self.web_broadcast_callback({
-                    'type': message_type,
-                    'data': data,
-                    'timestamp': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.error("Web broadcast failed", error=str(e))
+        callback = self.web_broadcast_callback
+        if callback is None:
+            return
+
+        try:
+            await callback({
+                'type': message_type,
+                'data': data,
+                'timestamp': timestamp or datetime.now().isoformat()
+            })
+        except Exception as e:
+            logger.error("Web broadcast failed", error=str(e))
 
     def _setup_notification(self, config: SersyncConfig):
         """设置通知系统"""
@@ -255,70 +301,6 @@ class SersyncEngine:
         except Exception as e:
             logger.error("Failed to initialize bidirectional sync", error=str(e))
 
-    def _setup_notification(self, config: SersyncConfig):
-        """设置通知系统"""
-        try:
-            from sersync.notification import (
-                NotificationService,
-                NotificationRuleEngine,
-                ImmediateRule,
-                BatchRule,
-                ScheduleRule,
-            )
-
-            # 初始化通知服务
-            self.notifier = NotificationService(
-                config_path=config.notification.apprise_config,
-                templates=config.notification.templates,
-                enabled=True
-            )
-
-            if not self.notifier.is_enabled():
-                logger.warning("Notification service not available (Apprise not installed)")
-                return
-
-            # 创建规则引擎
-            self.notification_engine = NotificationRuleEngine(self.notifier)
-
-            # 注册规则
-            for rule_config in config.notification.rules:
-                if rule_config['notify'] == 'immediate':
-                    rule = ImmediateRule(
-                        event=rule_config['event'],
-                        tags=rule_config['tags']
-                    )
-                elif rule_config['notify'] == 'batch':
-                    rule = BatchRule(
-                        event=rule_config['event'],
-                        tags=rule_config['tags'],
-                        batch_size=rule_config['batch_size'],
-                        batch_interval=rule_config['batch_interval']
-                    )
-                elif rule_config['notify'] == 'schedule':
-                    rule = ScheduleRule(
-                        event=rule_config['event'],
-                        tags=rule_config['tags'],
-                        cron=rule_config['cron']
-                    )
-                else:
-                    continue
-
-                self.notification_engine.register_rule(rule)
-
-            logger.info(
-                "Notification system initialized",
-                rules=len(config.notification.rules),
-                templates=len(config.notification.templates)
-            )
-
-        except ImportError:
-            logger.warning(
-                "Notification module not available",
-                hint="Install with: poetry install -E notifications"
-            )
-            self.notifier = None
-            self.notification_engine = None
-
     async def start(self):
         """启动引擎"""
         if self._running:
@@ -326,11 +308,12 @@ class SersyncEngine:
             return
 
         self._running = True
-        import time
         self.stats['start_time'] = time.time()
+        self._start_monotonic = time.monotonic()
 
         # 保存事件循环引用（用于线程安全调用）
         self._loop = asyncio.get_running_loop()
+        self._ingest_wakeup = asyncio.Event()
 
         logger.info("Starting Sersync engine")
 
@@ -338,6 +321,15 @@ class SersyncEngine:
             # 启动各个组件
             await self.event_queue.start_auto_flush()
 
+            ingest_task = asyncio.create_task(self._ingest_worker())
+            self._tasks.append(ingest_task)
+
+            # 启动数据库日志写入任务
+            if self._db is not None:
+                self._db_log_queue = asyncio.Queue(maxsize=DB_LOG_QUEUE_MAXSIZE)
+                db_writer_task = asyncio.create_task(self._db_writer_worker())
+                self._tasks.append(db_writer_task)
+
             # 启动通知引擎
             if self.notification_engine:
                 await self.notification_engine.start()
@@ -366,7 +358,9 @@ class SersyncEngine:
             if self.faillog_executor:
                 await self.faillog_executor.start()
 
-            # 启动 Web 状态推送
+            # 启动 Web 状态推送（预热 CPU 采样，使首次非阻塞读数有效）
+            if PSUTIL_AVAILABLE:
+                psutil.cpu_percent(interval=None)
             web_task = asyncio.create_task(self._web_status_worker())
             self._tasks.append(web_task)
 
@@ -379,8 +373,8 @@ class SersyncEngine:
                 web_broadcast_enabled=self.web_broadcast_callback is not None
             )
 
-            # 等待所有任务完成
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+            # 等待所有任务完成；任一任务异常退出时停止引擎（失败在 stop() 中记录）
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_EXCEPTION)
 
         except asyncio.CancelledError:
             logger.info("Engine cancelled")
@@ -411,13 +405,22 @@ class SersyncEngine:
         if self.faillog_executor:
             await self.faillog_executor.stop()
 
+        # 持久化双向同步状态
+        for bidir_engine in self.bidirectional_engines.values():
+            bidir_engine.metadata_manager.flush()
+
         # 取消所有任务
         for task in self._tasks:
             if not task.done():
                 task.cancel()
 
-        # 等待任务完成
-        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # 等待任务完成，不保留结果并释放任务引用
+        tasks, self._tasks = self._tasks, []
+        if tasks:
+            await asyncio.wait(tasks)
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Engine task failed", task=task.get_name(), error=str(task.exception()))
 
         # 输出最终统计
         logger.info("Sersync engine stopped", stats=self.get_stats())
@@ -436,29 +439,12 @@ class SersyncEngine:
             self.stats['files_filtered'] += 1
             return
 
-        # 推送到事件队列（需要转换为异步）
-        event = {
-            'type': event_type,
-            'path': file_path,
-            **kwargs
-        }
-
-        # 线程安全：使用 call_soon_threadsafe 在主事件循环中调度任务
+        # 交给 ingest 任务推送到事件队列（watchdog 后端在观察者线程中回调）
         if self._loop:
-            self._loop.call_soon_threadsafe(
-                asyncio.create_task,
-                self.event_queue.push(event)
-            )
-
-            # 推送事件到 Web 客户端
-            self._loop.call_soon_threadsafe(
-                asyncio.create_task,
-                self._broadcast_to_web('event', {
-                    'type': event_type,
-                    'path': file_path,
-                    'timestamp': datetime.now().isoformat()
-                })
-            )
+            self._ingest_deque.append((event_type, file_path, kwargs))
+            # 唤醒标志仍为 set 时 ingest 任务尚未清空通道，无需再次调度
+            if not self._ingest_wakeup.is_set():
+                self._loop.call_soon_threadsafe(self._ingest_wakeup.set)
 
         if self.config.debug:
             logger.debug(
@@ -467,6 +453,39 @@ class SersyncEngine:
                 path=file_path
             )
 
+    async def _ingest_worker(self):
+        """将监控回调收集的事件推送到事件队列，并转发给 Web 客户端"""
+        pending = self._ingest_deque
+        wakeup = self._ingest_wakeup
+
+        while self._running:
+            try:
+                await wakeup.wait()
+                # 先清除标志再取事件，清除之后追加的事件会重新唤醒
+                wakeup.clear()
+
+                while pending:
+                    event_type, file_path, extra = pending.popleft()
+                    await self.event_queue.push({
+                        'type': event_type,
+                        'path': file_path,
+                        **extra
+                    })
+
+                    # 推送事件到 Web 客户端（事件与消息共用一个时间戳）
+                    if self.web_broadcast_callback is not None:
+                        timestamp = datetime.now().isoformat()
+                        await self._broadcast_to_web('event', {
+                            'type': event_type,
+                            'path': file_path,
+                            'timestamp': timestamp
+                        }, timestamp)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Ingest worker error", error=str(e), exc_info=True)
+
     async def _event_worker(self, worker_id: int):
         """
         事件处理工作线程
@@ -478,18 +497,14 @@ class SersyncEngine:
 
         while self._running:
             try:
-                # 从队列获取事件
-                event = await asyncio.wait_for(
-                    self.event_queue.get(),
-                    timeout=1.0
-                )
+                # 从队列获取事件（直接等待，停止时由 stop() 取消任务退出，
+                # 不再为每次轮询创建超时计时器）
+                event = await self.event_queue.get()
 
                 # 处理事件
                 await self._process_event(event)
                 self.stats['events_processed'] += 1
 
-            except asyncio.TimeoutError:
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -519,7 +534,6 @@ class SersyncEngine:
         )
 
         # 记录开始时间（用于计算持续时间）
-        import time
         start_time = time.time()
 
         # 执行同步
@@ -528,50 +542,48 @@ class SersyncEngine:
         # 计算持续时间
         duration_ms = int((time.time() - start_time) * 1000)
 
-        # 记录同步日志到数据库
-        try:
-            if self.config.database.enabled:
-                from sersync.web.database import get_db_manager
-                db = get_db_manager()
-                
-                for remote_result in result['results']:
-                    # 解析远程信息
-                    remote_parts = remote_result['remote'].split('::')
-                    remote_ip = remote_parts[0] if len(remote_parts) > 0 else 'unknown'
-                    remote_module = remote_parts[1] if len(remote_parts) > 1 else 'unknown'
-                    
-                    # 记录到数据库
-                    db.add_sync_log(
-                        event_type=event_type,
-                        file_path=file_path,
-                        remote_ip=remote_ip,
-                        remote_module=remote_module,
-                        success=remote_result['success'],
-                        error_message=remote_result.get('error', '') if not remote_result['success'] else None,
-                        duration_ms=duration_ms
-                    )
-        except Exception as e:
-            logger.error("Failed to record sync log to database", error=str(e))
+        # 所有远程的日志和通知共用同一个完成时间
+        finished_at = datetime.now()
+
+        # 同步日志交给数据库写入任务批量提交
+        if self._db_log_queue is not None:
+            for remote_result in result['results']:
+                remote_ip, remote_module = self._remote_parse_cache[remote_result['remote']]
+                try:
+                    self._db_log_queue.put_nowait({
+                        'timestamp': finished_at,
+                        'event_type': event_type,
+                        'file_path': file_path,
+                        'remote_ip': remote_ip,
+                        'remote_module': remote_module,
+                        'success': remote_result['success'],
+                        'error_message': remote_result.get('error', '') if not remote_result['success'] else None,
+                        'duration_ms': duration_ms,
+                    })
+                except asyncio.QueueFull:
+                    logger.warning("Sync log queue full, record dropped", path=file_path)
 
         if result['all_success']:
             self.stats['files_synced'] += 1
-            self.stats['sync_success'] += len(self.config.remotes)
+            self.stats['sync_success'] += self._remotes_count
 
             logger.info(
                 "File synced successfully",
                 path=file_path,
-                remotes=len(self.config.remotes)
+                remotes=self._remotes_count
             )
 
             # 发送成功通知（批量）
             if self.notification_engine:
+                notify_time = finished_at.strftime('%Y-%m-%d %H:%M:%S')
                 for remote_result in result['results']:
+                    remote_ip, remote_module = self._remote_parse_cache[remote_result['remote']]
                     await self.notification_engine.trigger_event(
                         'sync_success',
                         file_path=file_path,
-                        remote_ip=remote_result['remote'].split('::')[0],
-                        remote_module=remote_result['remote'].split('::')[1] if '::' in remote_result['remote'] else '',
-                        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        remote_ip=remote_ip,
+                        remote_module=remote_module,
+                        timestamp=notify_time
                     )
         else:
             # 记录失败
@@ -586,16 +598,55 @@ class SersyncEngine:
 
             # 发送失败通知（立即）
             if self.notification_engine:
+                notify_time = finished_at.strftime('%Y-%m-%d %H:%M:%S')
                 for remote_result in failed_remotes:
+                    remote_ip, remote_module = self._remote_parse_cache[remote_result['remote']]
                     await self.notification_engine.trigger_event(
                         'sync_failed',
                         file_path=file_path,
-                        remote_ip=remote_result['remote'].split('::')[0],
-                        remote_module=remote_result['remote'].split('::')[1] if '::' in remote_result['remote'] else '',
+                        remote_ip=remote_ip,
+                        remote_module=remote_module,
                         error_message=remote_result.get('error', 'Unknown error'),
-                        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        timestamp=notify_time
                     )
 
+    async def _db_writer_worker(self):
+        """数据库写入工作线程：批量提交同步日志，停止时写入剩余记录"""
+        queue = self._db_log_queue
+        batch = []
+
+        try:
+            while self._running:
+                batch.append(await queue.get())
+                self._drain_db_log_queue(batch, DB_LOG_BATCH_SIZE)
+
+                # 不足一批时等待一个窗口，合并期间到达的记录
+                if len(batch) < DB_LOG_BATCH_SIZE:
+                    await asyncio.sleep(DB_LOG_FLUSH_INTERVAL)
+                    self._drain_db_log_queue(batch, DB_LOG_BATCH_SIZE)
+
+                rows, batch = batch, []
+                await asyncio.to_thread(self._write_sync_logs, rows)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._drain_db_log_queue(batch)
+            if batch:
+                self._write_sync_logs(batch)
+
+    def _drain_db_log_queue(self, batch: list, limit: Optional[int] = None):
+        """从同步日志队列中取出已到达的记录（不等待）"""
+        queue = self._db_log_queue
+        while not queue.empty() and (limit is None or len(batch) < limit):
+            batch.append(queue.get_nowait())
+
+    def _write_sync_logs(self, rows: list):
+        """在单个事务中写入一批同步日志"""
+        try:
+            self._db.add_sync_logs_bulk(rows)
+        except Exception as e:
+            logger.error("Failed to record sync log to database", error=str(e), count=len(rows))
+
     async def _crontab_worker(self):
         """定期全量同步工作线程"""
         schedule_minutes = self.config.crontab.schedule
@@ -644,6 +695,8 @@ class SersyncEngine:
         """Web 状态推送工作线程"""
         logger.info("Web status worker started")
 
+        next_metric = time.monotonic() + METRIC_RECORD_INTERVAL
+
         while self._running:
             try:
                 await asyncio.sleep(2)  # 每 2 秒推送一次状态
@@ -651,52 +704,56 @@ class SersyncEngine:
                 if not self._running:
                     break
 
+                # 没有 Web 客户端也不记录指标时无需采集
+                if self.web_broadcast_callback is None and self._db is None:
+                    continue
+
                 # 获取系统指标
-                try:
-                    import psutil
-                    cpu_percent = psutil.cpu_percent(interval=0.1)
+                if PSUTIL_AVAILABLE:
+                    cpu_percent = psutil.cpu_percent(interval=None)
                     memory = psutil.virtual_memory()
                     disk = psutil.disk_usage(self.config.watch_path)
-                except ImportError:
+                else:
                     cpu_percent = 0
-                    memory = type('obj', (object,), {'percent': 0})()
-                    disk = type('obj', (object,), {'percent': 0})()
-
-                # 计算运行时间
-                import time
-                uptime_seconds = int(time.time() - self.stats['start_time']) if self.stats['start_time'] else 0
-                hours = uptime_seconds // 3600
-                minutes = (uptime_seconds % 3600) // 60
-                seconds = uptime_seconds % 60
-                uptime_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
-                # 计算成功率
-                total_syncs = self.stats['sync_success'] + self.stats['sync_failed']
-                success_rate = (self.stats['sync_success'] / total_syncs * 100) if total_syncs > 0 else 100
+                    memory = disk = _ZERO_USAGE
 
                 # 获取队列大小
                 queue_stats = self.event_queue.get_stats()
 
-                # 推送状态到 Web 客户端
-                await self._broadcast_to_web('status', {
-                    'running': self._running,
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'disk_usage_percent': disk.percent,
-                    'uptime': uptime_str,
-                    'total_events': self.stats['events_processed'],
-                    'files_synced': self.stats['files_synced'],
-                    'queue_size': queue_stats.get('pending_events', 0),
-                    'success_rate': success_rate
-                })
+                # 推送状态到 Web 客户端（仅在有订阅者时构建状态）
+                if self.web_broadcast_callback is not None:
+                    # 计算运行时间
+                    uptime_seconds = int(time.monotonic() - self._start_monotonic)
+                    hours = uptime_seconds // 3600
+                    minutes = (uptime_seconds % 3600) // 60
+                    seconds = uptime_seconds % 60
+                    uptime_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+                    # 计算成功率
+                    total_syncs = self.stats['sync_success'] + self.stats['sync_failed']
+                    success_rate = (self.stats['sync_success'] / total_syncs * 100) if total_syncs > 0 else 100
+
+                    await self._broadcast_to_web('status', {
+                        'running': self._running,
+                        'cpu_percent': cpu_percent,
+                        'memory_percent': memory.percent,
+                        'disk_usage_percent': disk.percent,
+                        'uptime': uptime_str,
+                        'total_events': self.stats['events_processed'],
+                        'files_synced': self.stats['files_synced'],
+                        'queue_size': queue_stats.get('pending_events', 0),
+                        'success_rate': success_rate
+                    })
 
                 # 每30秒记录一次系统指标到数据库
-                if uptime_seconds % 30 == 0:
+                now = time.monotonic()
+                if now >= next_metric:
+                    next_metric = now + METRIC_RECORD_INTERVAL
                     try:
-                        if self.config.database.enabled:
-                            from sersync.web.database import get_db_manager
-                            db = get_db_manager()
-                            db.add_system_metric(
+                        if self._db is not None:
+                            # 在线程中写入，避免 SQLite 提交阻塞事件循环
+                            await asyncio.to_thread(
+                                self._db.add_system_metric,
                                 cpu_percent=cpu_percent,
                                 memory_percent=memory.percent,
                                 disk_usage_percent=disk.percent,
@@ -794,9 +851,8 @@ class SersyncEngine:
         return result
 
     def get_stats(self) -> dict:
-        """获取统计信息"""
-        import time
-        uptime = time.time() - self.stats['start_time'] if self.stats['start_time'] else 0
+        """获取统计信息（每次返回新字典，调用方可保留或修改）"""
+        uptime = time.monotonic() - self._start_monotonic if self._start_monotonic is not None else 0
 
         return {
             **self.stats,
@@ -7,15 +7,41 @@
 - 路径前缀匹配
 """
 
+import os
 import re
-from pathlib import Path
-from typing import List
+from typing import List, Optional
 import structlog
 
 from sersync.config.models import FilterConfig
 
 logger = structlog.get_logger()
 
+# 含反向引用的模式合并后组号会变化，不能直接拼接
+_BACKREF_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+
+def _combine_patterns(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+    """
+    将多个已编译正则合并为一个交替表达式
+
+    合并后一次 match 等价于逐个 match 后取 any。包含全局内联标志或
+    反向引用的模式无法安全合并，此时返回 None，调用方逐个匹配。
+    """
+    if not patterns:
+        return None
+
+    default_flags = re.compile('').flags
+    for pattern in patterns:
+        if pattern.flags != default_flags:
+            return None
+        if pattern.groups and _BACKREF_RE.search(pattern.pattern):
+            return None
+
+    try:
+        return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in patterns))
+    except re.error:
+        return None
+
 
 class FileFilter:
     """文件过滤器"""
@@ -68,6 +94,10 @@ class FileFilter:
             for pattern_str in self.DEFAULT_TEMP_PATTERNS:
                 self.temp_patterns.append(re.compile(pattern_str))
 
+        # 合并为单个正则，每个事件只需一次匹配
+        self._user_matcher = _combine_patterns(self.patterns)
+        self._temp_matcher = _combine_patterns(self.temp_patterns)
+
         logger.info(
             "File filter initialized",
             enabled=self.enabled,
@@ -99,30 +129,28 @@ class FileFilter:
 
     def _is_temp_file(self, file_path: str) -> bool:
         """检查是否是临时文件"""
-        filename = Path(file_path).name
+        filename = os.path.basename(file_path)
 
-        for pattern in self.temp_patterns:
-            if pattern.match(filename):
-                return True
+        if self._temp_matcher is not None:
+            return self._temp_matcher.match(filename) is not None
 
-        return False
+        return any(pattern.match(filename) for pattern in self.temp_patterns)
 
     def _matches_user_patterns(self, file_path: str) -> bool:
         """检查是否匹配用户定义的过滤模式"""
         # 获取相对路径进行匹配
         path_str = str(file_path)
+        filename = os.path.basename(path_str)
 
-        for pattern in self.patterns:
-            # 尝试匹配完整路径
-            if pattern.match(path_str):
-                return True
-
-            # 尝试匹配文件名
-            filename = Path(file_path).name
-            if pattern.match(filename):
-                return True
+        # 依次尝试匹配完整路径和文件名
+        if self._user_matcher is not None:
+            match = self._user_matcher.match
+            return match(path_str) is not None or match(filename) is not None
 
-        return False
+        return any(
+            pattern.match(path_str) or pattern.match(filename)
+            for pattern in self.patterns
+        )
 
     def filter_files(self, file_paths: List[str]) -> List[str]:
         """
@@ -160,6 +188,7 @@ class FileFilter:
         try:
             pattern = re.compile(pattern_str)
             self.patterns.append(pattern)
+            self._user_matcher = _combine_patterns(self.patterns)
             logger.info("Filter pattern added", pattern=pattern_str)
         except re.error as e:
             logger.error(
@@ -30,7 +30,6 @@ def setup_logging(
 
     # 处理器列表
     processors = [
-        structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
     ]
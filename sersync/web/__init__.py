@@ -8,11 +8,13 @@ Sersync Web 管理界面
 - 基础认证
 """
 
+import contextlib
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from typing import List, Dict, Any
 import structlog
+import uvicorn
 from pathlib import Path
 
 from sersync.web.auth import get_current_user
@@ -211,8 +213,44 @@ def setup_engine_integration(app: FastAPI):
         logger.warning("No engine instance available for WebSocket integration")
 
 
+# ========== 内嵌 Web 服务 ==========
+
+class EmbeddedServer(uvicorn.Server):
+    """与引擎共用事件循环运行的 uvicorn 服务，信号交由主程序处理"""
+
+    def install_signal_handlers(self):
+        # uvicorn < 0.29
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        # uvicorn >= 0.29
+        yield
+
+
+def create_server(app: FastAPI, host: str, port: int, log_level: str = "error") -> EmbeddedServer:
+    """
+    创建内嵌 Web 服务
+
+    调用方在引擎所在的事件循环中 await server.serve()，
+    停止时设置 server.should_exit = True。
+
+    Args:
+        app: FastAPI 应用实例
+        host: 监听地址
+        port: 监听端口
+        log_level: uvicorn 日志级别
+
+    Returns:
+        EmbeddedServer 实例
+    """
+    return EmbeddedServer(uvicorn.Config(app, host=host, port=port, log_level=log_level))
+
+
 __all__ = [
     'create_app',
+    'create_server',
+    'EmbeddedServer',
     'setup_engine_integration',
     'broadcast_to_clients',
     'manager'
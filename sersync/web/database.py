@@ -7,11 +7,12 @@
 - 性能指标
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, Text, text
+from sqlalchemy import create_engine, insert, Column, Integer, String, DateTime, Boolean, Float, Text, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 from pathlib import Path
+from typing import List
 import structlog
 
 logger = structlog.get_logger()
@@ -167,6 +168,26 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def add_sync_logs_bulk(self, rows: List[dict]):
+        """
+        批量添加同步日志（单个事务内 executemany 插入）
+
+        Args:
+            rows: 日志字典列表，字段与 add_sync_log 参数相同，可附带 timestamp
+        """
+        if not rows:
+            return
+
+        session = self.get_session()
+        try:
+            session.execute(insert(SyncLog), rows)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error("Failed to add sync logs", error=str(e), count=len(rows))
+        finally:
+            session.close()
+
     def add_system_metric(
         self,
         cpu_percent: float,
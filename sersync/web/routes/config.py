@@ -67,8 +67,8 @@ async def get_config_summary():
         filter_enabled=config.filter.enabled,
         filter_patterns=config.filter.patterns,
         rsync_params=config.rsync.common_params,
-        notification_enabled=config.notification.enabled,
-        web_enabled=config.web.enabled,
+        notification_enabled=config.notification is not None and config.notification.enabled,
+        web_enabled=config.web is not None and config.web.enabled,
         bidirectional_enabled=config.bidirectional.enabled,
     )
 
@@ -0,0 +1,68 @@
+"""配置解析器测试"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from sersync.bidirectional.sync_engine import ConflictResolution
+from sersync.config.parser import ConfigParser, TRUE_VALUES
+
+
+@pytest.fixture
+def parser():
+    return ConfigParser()
+
+
+@pytest.mark.parametrize("value", ["true", "True", "TRUE", "tRuE"])
+def test_parse_bool_accepts_any_case_of_true(parser, value):
+    assert parser._parse_bool(ET.Element("debug", start=value)) is True
+
+
+@pytest.mark.parametrize("value", ["false", "yes", "on", "1", "", " true", "truth"])
+def test_parse_bool_rejects_other_values(parser, value):
+    assert parser._parse_bool(ET.Element("debug", start=value)) is False
+
+
+def test_true_values_match_lower_equals_true():
+    assert TRUE_VALUES == {v for v in TRUE_VALUES if v.lower() == "true"}
+    assert len(TRUE_VALUES) == 2 ** len("true")
+
+
+def test_parse_bool_defaults(parser):
+    assert parser._parse_bool(None, default=True) is True
+    assert parser._parse_bool(ET.Element("debug"), default=True) is True
+    assert parser._parse_bool(ET.Element("debug")) is False
+
+
+def _remote(**attrib):
+    return ET.Element("remote", ip="10.0.0.1", name="backup", **attrib)
+
+
+def test_bidirectional_remote_strategy_resolved(parser):
+    (remote,) = parser._parse_remotes([
+        _remote(mode="bidirectional", conflict_strategy="backup_both")
+    ])
+    assert remote.resolved_strategy is ConflictResolution.BACKUP_BOTH
+
+
+def test_bidirectional_remote_invalid_strategy_rejected(parser):
+    with pytest.raises(ValueError, match="bogus"):
+        parser._parse_remotes([_remote(mode="bidirectional", conflict_strategy="bogus")])
+
+
+def test_unidirectional_remote_strategy_not_validated(parser):
+    (remote,) = parser._parse_remotes([_remote(conflict_strategy="bogus")])
+    assert remote.resolved_strategy is None
+
+
+def test_bidirectional_default_strategy_validated(parser):
+    config = parser._parse_bidirectional(
+        ET.Element("bidirectional", start="true", default_conflict_strategy="manual")
+    )
+    assert config.enabled is True
+    assert config.default_conflict_strategy == "manual"
+
+    with pytest.raises(ValueError, match="bogus"):
+        parser._parse_bidirectional(
+            ET.Element("bidirectional", default_conflict_strategy="bogus")
+        )
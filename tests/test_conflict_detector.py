@@ -0,0 +1,91 @@
+"""冲突检测器测试"""
+
+import hashlib
+import mmap
+
+import pytest
+
+from sersync.bidirectional import conflict_detector
+from sersync.bidirectional.conflict_detector import (
+    FileMetadata,
+    HASH_CHUNK_SIZE,
+    compute_content_hash,
+)
+
+
+@pytest.fixture
+def sha256_only(monkeypatch):
+    """强制走 SHA-256 路径，便于与 hashlib 结果比较"""
+    monkeypatch.setattr(conflict_detector, "BLAKE3_AVAILABLE", False)
+
+
+@pytest.mark.usefixtures("sha256_only")
+class TestComputeContentHash:
+    """内容哈希"""
+
+    @pytest.mark.parametrize("size", [0, 11, HASH_CHUNK_SIZE * 3 + 7])
+    def test_matches_sha256(self, tmp_path, size):
+        data = bytes(i % 251 for i in range(size))
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        assert compute_content_hash(str(path)) == hashlib.sha256(data).hexdigest()
+
+    def test_chunked_fallback_matches_sha256(self, tmp_path, monkeypatch):
+        def unmappable(*args, **kwargs):
+            raise OSError("mmap unavailable")
+
+        monkeypatch.setattr(mmap, "mmap", unmappable)
+        data = b"x" * (HASH_CHUNK_SIZE * 2 + 1)
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+
+        assert compute_content_hash(str(path)) == hashlib.sha256(data).hexdigest()
+
+    def test_missing_path_returns_none(self, tmp_path):
+        assert compute_content_hash(str(tmp_path / "gone.bin")) is None
+        assert compute_content_hash(str(tmp_path / "gone" / "child.bin")) is None
+
+
+class TestFileMetadataHash:
+    """FileMetadata 延迟哈希"""
+
+    def test_hash_computed_on_first_access_only(self):
+        calls = []
+
+        def hash_fn(path):
+            calls.append(path)
+            return "digest"
+
+        metadata = FileMetadata("a.txt", hash_fn=hash_fn)
+        assert calls == []
+        assert metadata.computed_hash is None
+
+        assert metadata.content_hash == "digest"
+        assert metadata.content_hash == "digest"
+        assert calls == ["a.txt"]
+        assert metadata.computed_hash == "digest"
+
+    @pytest.mark.usefixtures("sha256_only")
+    def test_from_local_file_defers_hashing(self, tmp_path, monkeypatch):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"content")
+        calls = []
+
+        def counting_hash(file_path):
+            calls.append(file_path)
+            return compute_content_hash(file_path)
+
+        monkeypatch.setattr(conflict_detector, "_hash_local_file", counting_hash)
+        metadata = FileMetadata.from_local_file(str(path))
+
+        assert metadata.exists and metadata.size == 7
+        assert calls == []
+        assert metadata.content_hash == hashlib.sha256(b"content").hexdigest()
+        assert calls == [str(path)]
+
+    def test_missing_local_file_has_no_hash(self, tmp_path):
+        metadata = FileMetadata.from_local_file(str(tmp_path / "gone.txt"))
+
+        assert metadata.exists is False
+        assert metadata.content_hash is None
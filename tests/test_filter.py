@@ -0,0 +1,62 @@
+"""文件过滤器测试"""
+
+import re
+
+import pytest
+
+from sersync.config.models import FilterConfig
+from sersync.core.filter import FileFilter, _combine_patterns
+
+
+def test_combine_patterns_empty():
+    assert _combine_patterns([]) is None
+
+
+def test_combine_patterns_matches_like_any():
+    patterns = [re.compile(p) for p in [r"(.*)\.tmp", r"^\.git", r"(.*)~"]]
+    combined = _combine_patterns(patterns)
+    assert combined is not None
+
+    for name in ["a.tmp", ".gitignore", "notes~", "a.txt", "x.tmpl", "git"]:
+        expected = any(p.match(name) for p in patterns)
+        assert (combined.match(name) is not None) == expected, name
+
+
+@pytest.mark.parametrize("pattern", [
+    r"(a)\1",           # 数字反向引用
+    r"(?P<x>a)(?P=x)",  # 命名反向引用
+    r"(?i)readme",      # 全局内联标志
+])
+def test_combine_patterns_falls_back(pattern):
+    patterns = [re.compile(r".*\.log$"), re.compile(pattern)]
+    assert _combine_patterns(patterns) is None
+
+
+def test_filter_fallback_still_matches():
+    file_filter = FileFilter(
+        FilterConfig(enabled=True, patterns=[r"(a)\1\.txt", r"(?i)readme"]),
+        enable_auto_temp_filter=False,
+    )
+    assert file_filter._user_matcher is None
+
+    assert file_filter.should_ignore("/data/aa.txt")
+    assert file_filter.should_ignore("/data/README")
+    assert not file_filter.should_ignore("/data/ab.txt")
+
+
+def test_add_pattern_rebuilds_matcher():
+    file_filter = FileFilter(
+        FilterConfig(enabled=True, patterns=[r"(.*)\.tmp"]),
+        enable_auto_temp_filter=False,
+    )
+    assert not file_filter.should_ignore("/data/build.log")
+
+    file_filter.add_pattern(r"(.*)\.log")
+    assert file_filter.should_ignore("/data/build.log")
+    assert file_filter.should_ignore("/data/a.tmp")
+
+    # 添加无法合并的模式后回退为逐个匹配
+    file_filter.add_pattern(r"(b)\1")
+    assert file_filter._user_matcher is None
+    assert file_filter.should_ignore("/data/bb")
+    assert file_filter.should_ignore("/data/build.log")
@@ -0,0 +1,146 @@
+"""双向同步元信息管理器测试"""
+
+import os
+
+import pytest
+
+from sersync.bidirectional import metadata_manager
+from sersync.bidirectional.metadata_manager import MetadataManager
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    watch = tmp_path / "watch"
+    watch.mkdir()
+    config = {
+        "metadata_dir": str(tmp_path / "state"),
+        "conflict_backup_dir": str(tmp_path / "conflicts"),
+    }
+    return watch, config
+
+
+def _manager(dirs) -> MetadataManager:
+    watch, config = dirs
+    return MetadataManager(str(watch), "backup", config)
+
+
+class TestJournal:
+    """追加日志的重放与压缩"""
+
+    def test_replay_after_sync(self, dirs):
+        manager = _manager(dirs)
+        manager.update_file_state("a.txt", 1.0, 10)
+        manager.bulk_update_file_states([("b.txt", 2.0, 20), ("c.txt", 3.0, 30)])
+        manager.remove_file_state("b.txt")
+        manager.sync_journal()
+
+        assert manager.get_sync_journal_file().exists()
+        assert not manager.get_sync_state_file().exists()
+
+        reloaded = _manager(dirs)
+        files = reloaded.load_sync_state()["files"]
+        assert sorted(files) == ["a.txt", "c.txt"]
+        assert files["c.txt"]["size"] == 30
+
+    def test_updates_are_buffered_until_sync(self, dirs):
+        manager = _manager(dirs)
+        manager.update_file_state("a.txt", 1.0, 10)
+        assert not manager.get_sync_journal_file().exists()
+
+        manager.sync_journal()
+        assert manager.get_sync_journal_file().exists()
+
+    def test_truncated_tail_ignored(self, dirs):
+        manager = _manager(dirs)
+        manager.bulk_update_file_states([("a.txt", 1.0, 10), ("b.txt", 2.0, 20)])
+        manager.sync_journal()
+
+        with open(manager.get_sync_journal_file(), "ab") as f:
+            f.write(b'{"op": "set", "path": "c.txt", "sta')
+
+        files = _manager(dirs).load_sync_state()["files"]
+        assert sorted(files) == ["a.txt", "b.txt"]
+
+    def test_flush_compacts_into_snapshot(self, dirs):
+        manager = _manager(dirs)
+        manager.bulk_update_file_states([("a.txt", 1.0, 10), ("b.txt", 2.0, 20)])
+        manager.sync_journal()
+        manager.bulk_remove_file_states(["a.txt"])
+        manager.flush()
+
+        assert manager.get_sync_state_file().exists()
+        assert not manager.get_sync_journal_file().exists()
+        assert sorted(_manager(dirs).load_sync_state()["files"]) == ["b.txt"]
+
+    def test_compacts_past_threshold(self, dirs, monkeypatch):
+        monkeypatch.setattr(metadata_manager, "JOURNAL_COMPACT_THRESHOLD", 5)
+        manager = _manager(dirs)
+        manager.bulk_update_file_states([(f"f{i}", 1.0, i) for i in range(6)])
+
+        assert manager.get_sync_state_file().exists()
+        assert not manager.get_sync_journal_file().exists()
+        assert len(_manager(dirs).load_sync_state()["files"]) == 6
+
+    def test_updated_at_persisted_as_iso(self, dirs):
+        manager = _manager(dirs)
+        manager.update_file_state("a.txt", 1.0, 10)
+        manager.flush()
+
+        updated_at = _manager(dirs).get_file_state("a.txt")["updated_at"]
+        assert isinstance(updated_at, str)
+        assert "T" in updated_at
+
+
+class TestConflictBackups:
+    """冲突备份"""
+
+    def test_backup_independent_of_source(self, dirs):
+        watch, _ = dirs
+        manager = _manager(dirs)
+        source = watch / "a.txt"
+        source.write_text("v1")
+
+        (backup,) = manager.copy_conflict_backups([("a.txt", str(source))])
+
+        # 原地追加写入不影响备份
+        with open(source, "a") as f:
+            f.write("-changed")
+
+        assert open(backup).read() == "v1"
+        assert os.stat(backup).st_ino != os.stat(source).st_ino
+
+    def test_existing_backup_never_overwritten(self, dirs):
+        watch, _ = dirs
+        manager = _manager(dirs)
+        source = watch / "a.txt"
+
+        source.write_text("first")
+        (first,) = manager.copy_conflict_backups([("a.txt", str(source))])
+        source.write_text("second")
+        second, third = manager.copy_conflict_backups([
+            ("a.txt", str(source)),
+            ("sub/a.txt", str(source)),
+        ])
+
+        assert len({first, second, third}) == 3
+        assert open(first).read() == "first"
+        assert open(second).read() == "second"
+        assert manager.get_stats()["conflict_backups"] == 3
+
+    def test_content_backups_share_naming(self, dirs):
+        manager = _manager(dirs)
+        first = manager.create_conflict_backup("a.txt", b"one")
+        second = manager.create_conflict_backup("a.txt", b"two")
+
+        assert first != second
+        assert open(first, "rb").read() == b"one"
+        assert open(second, "rb").read() == b"two"
+
+    def test_missing_source_leaves_no_partial_backup(self, dirs):
+        watch, config = dirs
+        manager = _manager(dirs)
+
+        with pytest.raises(FileNotFoundError):
+            manager.copy_conflict_backups([("gone.txt", str(watch / "gone.txt"))])
+
+        assert os.listdir(config["conflict_backup_dir"]) == []